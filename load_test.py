@@ -0,0 +1,158 @@
+"""
+Нагрузочный прогон YaNews или YaNote без внешних зависимостей.
+
+WSGI-приложение проекта вызывается прямо в процессе, без сети и сервера.
+Запросы строятся по смеси из news/load.py или notes/load.py на данных
+рабочей базы проекта, поэтому её стоит заранее заполнить командой
+manage.py seed. Выводятся p50/p95/p99 задержки по каждому URL и общая
+пропускная способность.
+
+Запуск: python load_test.py ya_news --requests 2000 --concurrency 4
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from pathlib import Path
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROJECTS = {
+    'ya_news': ('yanews.settings', 'news.load'),
+    'ya_note': ('yanote.settings', 'notes.load'),
+}
+
+
+def setup(project):
+    settings_module, mix_module = PROJECTS[project]
+    sys.path.insert(0, str(BASE_DIR / project))
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    from django.core.wsgi import get_wsgi_application
+    application = get_wsgi_application()
+    return application, import_module(mix_module).request_mix
+
+
+class Sessions:
+    """Сессии пользователей в хранилище проекта, по одной на пользователя."""
+
+    def __init__(self):
+        self.keys = {}
+
+    def cookie(self, user):
+        from django.conf import settings
+        from django.contrib.auth import (
+            BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY,
+        )
+        if user is None:
+            return ''
+        if user.pk not in self.keys:
+            engine = import_module(settings.SESSION_ENGINE)
+            session = engine.SessionStore()
+            session[SESSION_KEY] = str(user.pk)
+            session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+            session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+            session.save()
+            self.keys[user.pk] = session.session_key
+        return f'{settings.SESSION_COOKIE_NAME}={self.keys[user.pk]}'
+
+
+def plan(request_mix, sessions, count, rng):
+    """Заранее построенные запросы: (имя URL, путь, строка запроса, кука)."""
+    mix = request_mix(rng)
+    weights = [weight for weight, _ in mix]
+    requests = []
+    for build in rng.choices([build for _, build in mix], weights, k=count):
+        name, url, user = build()
+        parts = urlsplit(url)
+        requests.append(
+            (name, parts.path, parts.query, sessions.cookie(user))
+        )
+    return requests
+
+
+def call(application, request):
+    """Один GET через WSGI; возвращает имя URL, статус и время в мс."""
+    name, path, query, cookie = request
+    environ = {
+        'PATH_INFO': path, 'QUERY_STRING': query,
+        'HTTP_HOST': 'localhost', 'HTTP_COOKIE': cookie,
+    }
+    setup_testing_defaults(environ)
+    status = []
+    started = time.perf_counter()
+    result = application(
+        environ, lambda code, headers, *args: status.append(code)
+    )
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    elapsed = (time.perf_counter() - started) * 1000
+    return name, int(status[0].split()[0]), elapsed
+
+
+def percentiles(timings):
+    if len(timings) < 2:
+        return timings * 3
+    cuts = statistics.quantiles(timings, n=100, method='inclusive')
+    return cuts[49], cuts[94], cuts[98]
+
+
+def report(results, elapsed):
+    by_name = defaultdict(list)
+    statuses = defaultdict(Counter)
+    for name, status, timing in results:
+        by_name[name].append(timing)
+        statuses[name][status] += 1
+    by_name['всего'] = [timing for _, _, timing in results]
+    statuses['всего'] = sum(statuses.values(), Counter())
+    print(f'{"URL":<18} {"запросов":>8} {"p50, мс":>9} {"p95, мс":>9} '
+          f'{"p99, мс":>9}  статусы')
+    for name, timings in by_name.items():
+        p50, p95, p99 = percentiles(timings)
+        codes = ' '.join(
+            f'{code}×{number}' for code, number in sorted(
+                statuses[name].items()
+            )
+        )
+        print(f'{name:<18} {len(timings):>8} {p50:>9.2f} {p95:>9.2f} '
+              f'{p99:>9.2f}  {codes}')
+    print(f'Пропускная способность: {len(results) / elapsed:.1f} запросов/с')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('project', choices=PROJECTS)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    application, request_mix = setup(args.project)
+    rng = random.Random(args.seed)
+    requests = plan(
+        request_mix, Sessions(), args.warmup + args.requests, rng
+    )
+    for request in requests[:args.warmup]:
+        call(application, request)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(
+            lambda request: call(application, request),
+            requests[args.warmup:],
+        ))
+    report(results, time.perf_counter() - started)
+    return any(status >= 500 for _, status, _ in results)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
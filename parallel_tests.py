@@ -0,0 +1,131 @@
+"""
+Параллельный прогон тестов YaNews и YaNote.
+
+Оба проекта запускаются одновременно, тесты каждого делятся на шарды,
+каждый шард — отдельный процесс pytest. Тестовая база SQLite у pytest-django
+по умолчанию живёт в памяти процесса, так что у каждого шарда она своя.
+Результаты шардов сводятся в один JUnit-отчёт.
+
+Код выхода — битовая маска упавших проектов (1 — YaNews, 2 — YaNote),
+чтобы run_tests.sh мог вывести привычное сообщение для каждого из них.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from xml.etree import ElementTree
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROJECTS = {
+    'ya_news': ('yanews.settings', 1),
+    'ya_note': ('yanote.settings', 2),
+}
+
+
+def pytest_command(project, *args):
+    settings_module, _ = PROJECTS[project]
+    return dict(
+        args=[sys.executable, '-m', 'pytest', *args],
+        cwd=BASE_DIR / project,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module},
+        capture_output=True,
+        text=True,
+    )
+
+
+def collect(project):
+    """Идентификаторы всех тестов проекта."""
+    result = subprocess.run(
+        **pytest_command(project, '--collect-only', '-qqq')
+    )
+    if result.returncode:
+        return None, result.stdout + result.stderr
+    return [
+        line for line in result.stdout.splitlines() if '::' in line
+    ], ''
+
+
+def run_shard(project, number, node_ids, report_dir):
+    report = Path(report_dir) / f'{project}-{number}.xml'
+    result = subprocess.run(**pytest_command(
+        project, '--tb=line', '-q', f'--junitxml={report}', *node_ids
+    ))
+    return project, number, result, report
+
+
+def merge_reports(reports, path):
+    """Сводит JUnit-отчёты шардов в один файл."""
+    merged = ElementTree.Element('testsuites')
+    for project, number, report in reports:
+        if not report.exists():
+            continue
+        for suite in ElementTree.parse(report).getroot().iter('testsuite'):
+            suite.set('name', f'{project}[{number}]')
+            merged.append(suite)
+    ElementTree.ElementTree(merged).write(
+        path, encoding='utf-8', xml_declaration=True
+    )
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--workers', type=int, default=os.cpu_count() or 1,
+        help='Общее число процессов pytest на оба проекта.'
+    )
+    parser.add_argument(
+        '--junitxml', default=BASE_DIR / 'test-report.xml',
+        help='Куда записать сводный отчёт.'
+    )
+    args = parser.parse_args()
+    shards_per_project = max(1, args.workers // len(PROJECTS))
+    failed = 0
+    with ThreadPoolExecutor(max_workers=len(PROJECTS)) as pool:
+        collected = dict(zip(PROJECTS, pool.map(collect, PROJECTS)))
+    shards = []
+    for project, (node_ids, output) in collected.items():
+        if node_ids is None:
+            print(output, file=sys.stderr)
+            failed |= PROJECTS[project][1]
+            continue
+        count = min(shards_per_project, len(node_ids))
+        shards.extend(
+            (project, number, node_ids[number::count])
+            for number in range(count)
+        )
+    with tempfile.TemporaryDirectory() as report_dir, ThreadPoolExecutor(
+        max_workers=max(1, len(shards))
+    ) as pool:
+        results = list(pool.map(
+            lambda shard: run_shard(*shard, report_dir), shards
+        ))
+        for project, number, result, _ in results:
+            if result.returncode:
+                failed |= PROJECTS[project][1]
+                print(result.stdout + result.stderr, file=sys.stderr)
+        merged = merge_reports(
+            [(project, number, report)
+             for project, number, _, report in results],
+            args.junitxml,
+        )
+    totals = {
+        key: sum(int(suite.get(key, 0)) for suite in merged)
+        for key in ('tests', 'failures', 'errors', 'skipped')
+    }
+    print(
+        'Шардов: {shards}, тестов: {tests}, упало: {failures}, '
+        'ошибок: {errors}, пропущено: {skipped}. Отчёт: {report}'.format(
+            shards=len(shards), report=args.junitxml, **totals
+        ),
+        file=sys.stderr,
+    )
+    return failed
+
+
+if __name__ == '__main__':
+    sys.exit(main())
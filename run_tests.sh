@@ -21,6 +21,23 @@ then
     echo $LF 1>&2
     if python structure_test.py
     then
+        if [[ "$1" == "--parallel" ]]
+        then
+            # Оба проекта сразу, каждый разбит на шарды по процессам.
+            # Код выхода parallel_tests.py: бит 1 — YaNews, бит 2 — YaNote.
+            python parallel_tests.py "${@:2}" 1>&2
+            status=$?
+            if (( status & 1 )); then
+                print_message " При запуске упали ваши тесты для проекта YaNews. Проверьте тесты этого проекта " "=" 1
+            fi
+            if (( status & 2 )); then
+                print_message " При запуске упали ваши тесты для проекта YaNote. Проверьте тесты этого проекта " "=" 1
+            fi
+            if (( status )); then
+                echo \`\`\` 1>&2
+            fi
+            exit $status
+        fi
         cd ya_news
         export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanews.settings"}"
         if pytest --tb=line 1>&2;
@@ -0,0 +1,7 @@
+"""
+Код, общий для YaNews и YaNote.
+
+Проекты запускаются каждый из своего каталога, поэтому пакеты их
+приложений добавляют корень репозитория в sys.path, см. news/__init__.py
+и notes/__init__.py.
+"""
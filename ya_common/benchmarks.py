@@ -0,0 +1,105 @@
+"""
+Регрессионные замеры горячих страниц, общая часть.
+
+conftest.py в пакете benchmarks проекта импортирует отсюда хуки pytest и
+фикстуру benchmark и добавляет свои данные. Медиана каждого замера
+сравнивается с baselines.json рядом с тестами; тест падает, если
+страница стала медленнее базовой больше чем на --benchmark-threshold
+процентов. Новые базовые значения записываются с --benchmark-save.
+"""
+import json
+import platform
+import statistics
+import time
+
+import django
+import pytest
+
+WARMUP = 3
+
+
+def measure(func, repeat=50):
+    """Медиана времени вызова func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmark')
+    group.addoption(
+        '--benchmark-threshold', type=float, default=50.0,
+        help='Допустимое замедление относительно базового, в процентах.'
+    )
+    group.addoption(
+        '--benchmark-rounds', type=int, default=20,
+        help='Сколько раз повторять каждый замер.'
+    )
+    group.addoption(
+        '--benchmark-save', action='store_true',
+        help='Записать медианы этого прогона в baselines.json.'
+    )
+
+
+def pytest_configure(config):
+    config.benchmark_results = {}
+    config.benchmark_baselines = None
+
+
+@pytest.fixture
+def benchmark(request):
+    """Замер медианы вызова func и сверка с базовым значением."""
+    config = request.config
+    path = config.benchmark_baselines = (
+        request.path.with_name('baselines.json')
+    )
+    baselines = json.loads(path.read_text()) if path.exists() else {}
+
+    def run(func):
+        # Первые вызовы прогревают шаблоны, URL-резолвер и соединение.
+        for _ in range(WARMUP):
+            func()
+        median = measure(func, config.getoption('benchmark_rounds'))
+        config.benchmark_results[request.node.name] = median
+        baseline = baselines.get('results', {}).get(request.node.name)
+        limit = config.getoption('benchmark_threshold')
+        if (
+            baseline is not None
+            and not config.getoption('benchmark_save')
+            and median > baseline * (1 + limit / 100)
+        ):
+            pytest.fail(
+                f'{request.node.name}: {median:.2f} мс против базовых '
+                f'{baseline:.2f} мс, медленнее больше чем на {limit:g}%.',
+                pytrace=False,
+            )
+        return median
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = getattr(config, 'benchmark_results', None)
+    if not results:
+        return
+    terminalreporter.section('медианы, мс')
+    for name, median in results.items():
+        terminalreporter.write_line(f'{name:<50} {median:>9.2f}')
+    if config.getoption('benchmark_save'):
+        config.benchmark_baselines.write_text(json.dumps({
+            'machine': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'processor': platform.machine(),
+            },
+            'results': {
+                name: round(median, 2)
+                for name, median in sorted(results.items())
+            },
+        }, ensure_ascii=False, indent=2) + '\n')
+        terminalreporter.write_line(
+            f'Базовые значения записаны в {config.benchmark_baselines}'
+        )
@@ -0,0 +1,53 @@
+"""
+Общий для процессов сервера кэш и проверка, что он настроен.
+
+Версии страниц YaNews и списков YaNote живут в кэше по умолчанию, поэтому
+он должен быть виден всем воркерам: Memcached, Redis или файловый кэш
+отсюда.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache.backends import filebased
+from django.core.checks import Error
+
+# Кэши, содержимое которых видит только свой процесс.
+PROCESS_LOCAL_CACHES = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """
+    Файловый кэш, который пересчитывает файлы не на каждой записи.
+
+    Django перечисляет весь каталог кэша при каждом set(), чтобы сверить
+    число файлов с MAX_ENTRIES, и запись дорожает вместе с кэшем. Здесь
+    каталог проверяется не чаще раза в OPTIONS['CULL_INTERVAL'] секунд;
+    между проверками MAX_ENTRIES может быть превышен на число записей.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_interval = params.get('OPTIONS', {}).get(
+            'CULL_INTERVAL', 60
+        )
+        self._next_cull = 0
+
+    def _cull(self):
+        now = time.monotonic()
+        if now < self._next_cull:
+            return
+        self._next_cull = now + self._cull_interval
+        super()._cull()
+
+
+def process_local_cache_errors(error_id):
+    """Ошибка проверки, если кэш по умолчанию виден только своему процессу."""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        'Кэш по умолчанию виден только своему процессу.',
+        hint='Укажите в CACHES общий кэш: Memcached, Redis или '
+             'ya_common.caching.FileBasedCache.',
+        id=error_id,
+    )]
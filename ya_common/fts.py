@@ -0,0 +1,80 @@
+"""
+Полнотекстовый индекс FTS5 над таблицей модели для миграций.
+
+Источник индекса — представление, где в текстовых колонках «ё» заменена
+на «е»: unicode61 снимает диакритику только с латиницы. Триггеры держат
+индекс в согласии с таблицей при любой записи, включая bulk_create и
+update(). На других СУБД операция ничего не делает.
+"""
+from django.db import migrations
+
+NORMALIZE = "replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def fts5_statements(table, text_columns, plain_columns=()):
+    """SQL создания и удаления индекса {table}_fts."""
+    fts = f'{table}_fts'
+    names = ', '.join((*text_columns, *plain_columns))
+
+    def values(prefix):
+        return ', '.join(
+            [NORMALIZE.format(column=f'{prefix}{column}')
+             for column in text_columns]
+            + [f'{prefix}{column}' for column in plain_columns]
+        )
+
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {values('old.')});"
+    )
+    insert = (
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {values('new.')});"
+    )
+    create = [
+        f'''CREATE VIEW {fts}_source(id, {names}) AS
+            SELECT id, {values('')} FROM {table}''',
+        f'''CREATE VIRTUAL TABLE {fts} USING fts5(
+            {names},
+            content='{fts}_source', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )''',
+        f'''CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN
+            {insert}
+        END''',
+        f'''CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN
+            {delete}
+        END''',
+        f'''CREATE TRIGGER {fts}_update
+        AFTER UPDATE OF {names} ON {table} BEGIN
+            {delete}
+            {insert}
+        END''',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+    drop = [
+        f'DROP TRIGGER IF EXISTS {fts}_update',
+        f'DROP TRIGGER IF EXISTS {fts}_delete',
+        f'DROP TRIGGER IF EXISTS {fts}_insert',
+        f'DROP TABLE IF EXISTS {fts}',
+        f'DROP VIEW IF EXISTS {fts}_source',
+    ]
+    return create, drop
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement, params=None)
+    return operation
+
+
+def fts5_index(table, text_columns, plain_columns=()):
+    """
+    Операция миграции, создающая индекс над колонками таблицы.
+
+    text_columns нормализуются, plain_columns попадают в индекс как есть.
+    """
+    create, drop = fts5_statements(table, text_columns, plain_columns)
+    return migrations.RunPython(run(create), run(drop))
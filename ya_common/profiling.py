@@ -0,0 +1,154 @@
+"""
+Профилирование запросов по настройке PROFILING.
+
+Для каждого запроса считаются общее время, число и время SQL-запросов
+и время отрисовки шаблона. Они уходят в заголовок Server-Timing и в
+скользящие гистограммы по имени URL, которые читает snapshot(). Доля
+запросов PROFILING_SAMPLE_RATE дополнительно снимается cProfile в
+каталог PROFILING_DIR. При выключенной настройке middleware исключается
+из цепочки при старте и ничего не стоит.
+"""
+import cProfile
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Верхние границы корзин гистограммы общего времени, мс.
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, float('inf'))
+METRICS = ('total', 'sql', 'template')
+# Общий ключ запросов, не попавших ни в один маршрут: путь таких запросов
+# задаёт клиент, и по нему гистограммы росли бы без предела.
+UNRESOLVED = 'unresolved'
+
+_lock = threading.Lock()
+_samples = defaultdict(
+    lambda: deque(maxlen=settings.PROFILING_HISTOGRAM_SIZE)
+)
+# cProfile не умеет профилировать два потока сразу.
+_profiler_lock = threading.Lock()
+
+
+class RequestTimings:
+    """Счётчики одного запроса."""
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql = 0.0
+        self.template = 0.0
+        self.template_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка connection.execute_wrapper вокруг каждого запроса."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql += time.perf_counter() - started
+            self.sql_count += 1
+
+    def rendered(self, response):
+        self.template = time.perf_counter() - self.template_started
+
+
+def record(url_name, total, timings):
+    with _lock:
+        _samples[url_name].append(
+            (total, timings.sql * 1000, timings.template * 1000)
+        )
+
+
+def snapshot():
+    """Медиана, p95 и корзины общего времени по каждому имени URL."""
+    with _lock:
+        samples = {name: list(rows) for name, rows in _samples.items()}
+    result = {}
+    for name, rows in samples.items():
+        stats = {'count': len(rows)}
+        for metric, values in zip(METRICS, zip(*rows)):
+            values = sorted(values)
+            stats[metric] = {
+                'p50': values[len(values) // 2],
+                'p95': values[min(len(values) - 1, len(values) * 95 // 100)],
+            }
+        buckets = [0] * len(BUCKETS)
+        for total, _, _ in rows:
+            buckets[bisect_left(BUCKETS, total)] += 1
+        stats['buckets'] = dict(zip(BUCKETS, buckets))
+        result[name] = stats
+    return result
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+
+
+class ProfilingMiddleware:
+    """Замеры запроса; ставится первым в MIDDLEWARE."""
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.profile_dir = settings.PROFILING_DIR
+
+    def __call__(self, request):
+        timings = request._profiling_timings = RequestTimings()
+        profiler = self.start_profiler()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _profiler_lock.release()
+        total = (time.perf_counter() - started) * 1000
+        match = request.resolver_match
+        url_name = match.view_name if match else UNRESOLVED
+        record(url_name, total, timings)
+        if profiler is not None:
+            self.dump(profiler, url_name)
+        response.headers['Server-Timing'] = ', '.join((
+            f'total;dur={total:.1f}',
+            f'sql;dur={timings.sql * 1000:.1f};'
+            f'desc="{timings.sql_count} queries"',
+            f'template;dur={timings.template * 1000:.1f}',
+        ))
+        return response
+
+    def process_template_response(self, request, response):
+        # Middleware первый в списке, поэтому этот хук вызывается
+        # последним, непосредственно перед отрисовкой шаблона.
+        timings = request._profiling_timings
+        timings.template_started = time.perf_counter()
+        response.add_post_render_callback(timings.rendered)
+        return response
+
+    def start_profiler(self):
+        if (
+            not self.profile_dir
+            or random.random() >= self.sample_rate
+            or not _profiler_lock.acquire(blocking=False)
+        ):
+            return None
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def dump(self, profiler, url_name):
+        directory = Path(self.profile_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = url_name.replace(':', '-')
+        profiler.dump_stats(directory / f'{name}-{time.time_ns()}.prof')
@@ -0,0 +1,42 @@
+"""
+Основы русских слов для поиска по префиксу в FTS5.
+
+Индекс строится миграцией через fts5_index из ya_common.fts.
+"""
+import re
+
+WORD = re.compile(r'\w+')
+CYRILLIC = re.compile(r'[а-я]+')
+# Окончания, которые отбрасываются у русских слов перед поиском по
+# префиксу: «новостями» и «новости» ищутся как «новост*».
+ENDINGS = sorted((
+    'иями', 'ями', 'ами', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими',
+    'ая', 'яя', 'ое', 'ее', 'ие', 'ые', 'ой', 'ей', 'ий', 'ый', 'ом',
+    'ем', 'ам', 'ям', 'ах', 'ях', 'ию', 'ью', 'ия', 'ья', 'ов', 'ев',
+    'ую', 'юю', 'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+), key=len, reverse=True)
+MIN_STEM_LENGTH = 3
+
+
+def stem(word):
+    """Грубая основа русского слова; прочие слова не меняются."""
+    if not CYRILLIC.fullmatch(word):
+        return word
+    for ending in ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[:-len(ending)]
+    return word
+
+
+def prefix_terms(text):
+    """
+    Слова строки поиска для MATCH, каждое по префиксу своей основы.
+
+    Синтаксис FTS5 из пользовательского ввода не проходит: в выражение
+    попадают только слова в кавычках. Пустая строка — искать нечего.
+    """
+    words = WORD.findall(text.lower().replace('ё', 'е'))
+    return ' '.join(f'"{stem(word)}"*' for word in words)
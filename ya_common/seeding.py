@@ -0,0 +1,43 @@
+"""Генераторы синтетических текстов и пользователей для команд seed."""
+import math
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db.models import Max
+
+SYLLABLES = (
+    'ба', 'ве', 'ви', 'го', 'да', 'де', 'жи', 'за', 'ко', 'ла', 'ли', 'ма',
+    'ми', 'на', 'но', 'ны', 'по', 'ра', 'ре', 'ро', 'са', 'сти', 'та', 'то',
+    'ту', 'че', 'ша', 'щи', 'ю', 'я', 'ст', 'ль', 'ка', 'ник', 'ость',
+)
+PASSWORD = 'seed-password'
+
+
+def word(rng):
+    return ''.join(rng.choices(SYLLABLES, k=rng.randint(1, 4)))
+
+
+def sentence(rng, words):
+    return ' '.join(word(rng) for _ in range(words)).capitalize()
+
+
+def lognormal(rng, median, sigma, low, high):
+    """Целое логнормальное число с медианой median в пределах [low, high]."""
+    value = round(rng.lognormvariate(math.log(median), sigma))
+    return max(low, min(high, value))
+
+
+def zipf_weights(count):
+    return list(accumulate(1 / rank for rank in range(1, count + 1)))
+
+
+def seed_users(count, prefix='user'):
+    """Пользователи с общим паролем PASSWORD; хэш считается один раз."""
+    User = get_user_model()
+    first = (User.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+    password = make_password(PASSWORD)
+    return User.objects.bulk_create(
+        User(username=f'{prefix}{first + index}', password=password)
+        for index in range(count)
+    )
@@ -0,0 +1,93 @@
+"""
+Помощники тестов обоих проектов: бюджет SQL-запросов и вход без базы.
+
+Бюджеты у каждого проекта свои, их задаёт подкласс QueryBudgetClient.
+"""
+import re
+from collections import Counter
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY,
+)
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404
+
+# Сессии в тестах хранятся в подписанной куке, а не в таблице сессий.
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+AUTH_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def format_queries(queries):
+    """Повторяющиеся с точностью до параметров запросы — признак N+1."""
+    templates = Counter(
+        LITERALS.sub('?', query['sql']) for query in queries
+    )
+    duplicated = [
+        f'  {count} × {sql}'
+        for sql, count in templates.most_common() if count > 1
+    ]
+    if not duplicated:
+        return '\n'.join(f'  {query["sql"]}' for query in queries)
+    return 'Повторяющиеся запросы:\n' + '\n'.join(duplicated)
+
+
+class QueryBudgetClient(Client):
+    """Тестовый клиент, который сверяет число запросов с бюджетом."""
+
+    # {имя URL: {метод: наибольшее число запросов}}.
+    budgets = {}
+
+    def request(self, **request):
+        with CaptureQueriesContext(connection) as context:
+            response = super().request(**request)
+        response.captured_queries = context.captured_queries
+        self.check_budget(response)
+        return response
+
+    def check_budget(self, response):
+        try:
+            view_name = response.resolver_match.view_name
+        except Resolver404:
+            # Мимо маршрутов: бюджета для такого запроса нет.
+            return
+        method = response.request['REQUEST_METHOD']
+        budget = self.budgets.get(view_name, {}).get(method)
+        queries = response.captured_queries
+        if budget is not None and len(queries) > budget:
+            raise AssertionError(
+                f'{method} {view_name}: {len(queries)} SQL-запросов '
+                f'при бюджете {budget}.\n{format_queries(queries)}'
+            )
+
+
+_session_keys = {}
+
+
+def session_key_for(user):
+    """
+    Ключ сессии, в которой пользователь уже вошёл.
+
+    Выпускается один раз на пользователя за прогон тестов. С движком
+    signed_cookies ключ и есть подписанные данные, база не участвует.
+    """
+    key = (settings.SESSION_ENGINE, user.pk, user.get_session_auth_hash())
+    if key not in _session_keys:
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+        session[BACKEND_SESSION_KEY] = AUTH_BACKEND
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        _session_keys[key] = session.session_key
+    return _session_keys[key]
+
+
+def login(client, user):
+    """Замена client.force_login без записи в базу."""
+    client.cookies[settings.SESSION_COOKIE_NAME] = session_key_for(user)
+    return client
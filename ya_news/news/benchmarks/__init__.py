@@ -0,0 +1,48 @@
+"""
+Ручные бенчмарки ya_news.
+
+Запуск из каталога ya_news: python -m news.benchmarks.<модуль>.
+Каждый бенчмарк работает на временной тестовой базе и не трогает
+рабочую db.sqlite3. Кэш — настроенный в CACHES, но в своём временном
+каталоге.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+from ya_common.benchmarks import measure  # noqa: F401
+
+
+@contextmanager
+def benchmark_database(name=None):
+    """
+    Поднимает Django и тестовую базу на время бенчмарка.
+
+    По умолчанию база в памяти; name задаёт файл, если бенчмарку нужны
+    настоящие блокировки и журнал SQLite.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test import override_settings
+    from django.test.utils import (
+        setup_databases, setup_test_environment, teardown_databases,
+        teardown_test_environment,
+    )
+    setup_test_environment()
+    if name is not None:
+        connection.settings_dict['TEST']['NAME'] = name
+    # Как и тестовый раннер, настраивает зеркала: реплика смотрит в ту же
+    # тестовую базу.
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        with tempfile.TemporaryDirectory() as location, override_settings(
+            CACHES={'default': {**settings.CACHES['default'],
+                                'LOCATION': location}}
+        ):
+            yield connection
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,113 @@
+"""
+Пропускная способность синхронных и асинхронных ленты и новости под ASGI.
+
+ASGI-приложение вызывается прямо в процессе: --connections сопрограмм
+одновременно шлют GET на ленту и страницы новостей, пока не наберётся
+--requests ответов. Синхронные представления Django выполняет в потоке
+через sync_to_async, асинхронные — в цикле событий.
+
+Запуск: python -m news.benchmarks.asgi --connections 500
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from . import benchmark_database
+
+URLCONFS = {
+    'sync': 'yanews.urls',
+    'async': 'yanews.async_urls',
+}
+
+
+async def call(application, path):
+    """Один GET; возвращает статус и время ответа в мс."""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': b'',
+        'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    requested = False
+    status = []
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            # Соединение не рвётся: обработчик сам снимет ожидание.
+            await asyncio.Future()
+        requested = True
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    return status[0], (time.perf_counter() - started) * 1000
+
+
+async def run(application, paths, connections):
+    queue = iter(paths)
+    results = []
+
+    async def connection():
+        for path in queue:
+            results.append(await call(application, path))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--news', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    with benchmark_database():
+        from django.core.asgi import get_asgi_application
+        from django.test import override_settings
+        from django.urls import reverse
+
+        from news.models import News
+        from news.seeding import seed_news
+        from ya_common.seeding import seed_users
+
+        rng = random.Random(args.seed)
+        seed_news(
+            rng, seed_users(50), args.news, args.comments, 5000,
+            lambda message: None,
+        )
+        ids = list(News.objects.values_list('pk', flat=True))
+        application = get_asgi_application()
+        print(f'Соединений: {args.connections}, запросов: {args.requests}')
+        print(f'{"views":>6} {"запросов/с":>11} {"p50, мс":>9} '
+              f'{"p99, мс":>9}  статусы')
+        for name, urlconf in URLCONFS.items():
+            with override_settings(ROOT_URLCONF=urlconf):
+                paths = [
+                    reverse('news:home') if rng.random() < 0.3
+                    else reverse('news:detail', args=(rng.choice(ids),))
+                    for _ in range(args.requests)
+                ]
+                asyncio.run(run(application, paths[:100], 10))
+                results, elapsed = asyncio.run(
+                    run(application, paths, args.connections)
+                )
+            timings = [timing for _, timing in results]
+            cuts = statistics.quantiles(timings, n=100, method='inclusive')
+            statuses = sorted({status for status, _ in results})
+            print(f'{name:>6} {len(results) / elapsed:>11.1f} '
+                  f'{cuts[49]:>9.1f} {cuts[98]:>9.1f}  {statuses}')
+
+
+if __name__ == '__main__':
+    main()
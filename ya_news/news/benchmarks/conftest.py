@@ -0,0 +1,35 @@
+"""
+Регрессионные замеры горячих страниц YaNews.
+
+Запуск из каталога ya_news: pytest news/benchmarks. Сверка с baselines.json
+и параметры командной строки — в ya_common.benchmarks.
+"""
+import random
+
+import pytest
+
+from news.models import News
+from news.pytest_tests.conftest import process_cache  # noqa: F401
+from news.seeding import seed_news
+from ya_common.benchmarks import (  # noqa: F401
+    benchmark, pytest_addoption, pytest_configure, pytest_terminal_summary,
+)
+from ya_common.seeding import seed_users
+
+
+@pytest.fixture(scope='session')
+def seeded(process_cache, django_db_setup, django_db_blocker):
+    """
+    Общие данные замеров: лента, новости с 1k и 10k комментариев.
+
+    Строятся один раз на прогон теми же функциями, что и команда seed.
+    """
+    with django_db_blocker.unblock():
+        rng = random.Random(0)
+        users = seed_users(20)
+        seed_news(rng, users, 1000, 0, 5000, lambda message: None)
+        threads = {}
+        for size in (1000, 10_000):
+            seed_news(rng, users, 1, size, 5000, lambda message: None)
+            threads[size] = News.objects.order_by('-pk').first()
+        return users, threads
@@ -0,0 +1,67 @@
+"""
+Курсорная пагинация ленты против OFFSET.
+
+Запуск: python -m news.benchmarks.feed_pagination --rows 1000000
+"""
+import argparse
+from datetime import date, timedelta
+
+from . import benchmark_database, measure
+
+PAGES = (1, 10, 100, 1_000, 10_000)
+
+
+def fill_news(rows, batch_size=10_000):
+    """Лента с повторяющимися датами, чтобы работал tie-breaker по id."""
+    from django.db import transaction
+    from news.models import News
+    first_day = date(2000, 1, 1)
+    with transaction.atomic():
+        for start in range(0, rows, batch_size):
+            News.objects.bulk_create(
+                News(
+                    title=f'Новость {index}',
+                    text='Просто текст.',
+                    date=first_day + timedelta(days=index // 50),
+                )
+                for index in range(start, min(start + batch_size, rows))
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    with benchmark_database():
+        from django.conf import settings
+        from news.models import News
+        from news.pagination import NEXT, KeysetPaginator, encode_cursor
+
+        fill_news(args.rows)
+        per_page = settings.NEWS_COUNT_ON_HOME_PAGE
+        queryset = News.objects.all()
+        paginator = KeysetPaginator(queryset, per_page)
+        print(f'Новостей: {args.rows}, на странице: {per_page}')
+        print(f'{"страница":>10} {"keyset, мс":>12} {"OFFSET, мс":>12}')
+        for number in PAGES:
+            offset = (number - 1) * per_page
+            if offset >= args.rows:
+                break
+            cursor = None
+            if offset:
+                cursor = encode_cursor(
+                    NEXT, paginator._key(queryset[offset - 1])
+                )
+            keyset = measure(
+                lambda: paginator.get_page(cursor), args.repeat
+            )
+            plain = measure(
+                lambda: list(queryset[offset:offset + per_page]),
+                args.repeat,
+            )
+            print(f'{number:>10} {keyset:>12.3f} {plain:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
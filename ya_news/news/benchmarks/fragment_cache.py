@@ -0,0 +1,79 @@
+"""
+Рендер ленты и страницы новости с холодным и тёплым кэшем фрагментов.
+
+Кэш — настроенный в CACHES. Перед замером открываются --visited других
+новостей, чтобы в кэше было столько ключей, сколько на живом сервере.
+
+Запуск: python -m news.benchmarks.fragment_cache --comments 50
+"""
+import argparse
+
+from . import benchmark_database, measure
+
+PARAGRAPH = 'Длинный комментарий к новости, ' * 20
+
+
+def fill(comments, visited):
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from news.models import Comment, News
+    author = get_user_model().objects.create(username='Автор')
+    others = News.objects.bulk_create(
+        News(title=f'Другая новость {index}', text='Текст. ' * 50)
+        for index in range(visited)
+    )
+    Comment.objects.bulk_create(
+        Comment(news=other, author=author, text=PARAGRAPH)
+        for other in others for _ in range(5)
+    )
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Просто текст. ' * 50)
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE)
+    )
+    news = News.objects.order_by('pk').last()
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'{PARAGRAPH}\n' * 5)
+        for _ in range(comments)
+    )
+    News.objects.recount_comments()
+    return news, others
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--comments', type=int, default=50)
+    parser.add_argument('--visited', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    with benchmark_database():
+        from django.conf import settings
+        from django.core.cache import cache
+        from django.test import Client
+        from django.urls import reverse
+
+        news, others = fill(args.comments, args.visited)
+        client = Client()
+        for other in others:
+            client.get(reverse('news:detail', args=(other.pk,)))
+        pages = {
+            'лента': reverse('news:home'),
+            'новость': reverse('news:detail', args=(news.pk,)),
+        }
+        warm = {}
+        for name, url in pages.items():
+            client.get(url)
+            warm[name] = measure(lambda: client.get(url), args.repeat)
+        print(f'Кэш: {settings.CACHES["default"]["BACKEND"]}')
+        print(f'Комментариев к новости: {args.comments}, '
+              f'открыто других новостей: {args.visited}')
+        print(f'{"страница":>10} {"холодный, мс":>14} {"тёплый, мс":>12}')
+        # Холодный замер очищает кэш, поэтому он идёт после тёплых.
+        for name, url in pages.items():
+            cold = measure(
+                lambda: (cache.clear(), client.get(url)), args.repeat
+            )
+            print(f'{name:>10} {cold:>14.2f} {warm[name]:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Автомат Ахо — Корасик против цикла с поиском подстроки.
+
+Запуск: python -m news.benchmarks.profanity --words 20000
+"""
+import argparse
+import random
+
+from news.profanity import BadWordsMatcher
+
+from . import measure
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def loop_search(words, text):
+    """Прежняя проверка из CommentForm.clean_text."""
+    lowered_text = text.lower()
+    return [word for word in words if word in lowered_text]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=20_000)
+    parser.add_argument('--text-length', type=int, default=2_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    words = tuple(
+        ''.join(rng.choices(ALPHABET, k=rng.randint(6, 12)))
+        for _ in range(args.words)
+    )
+    text = ' '.join(
+        ''.join(rng.choices(ALPHABET, k=rng.randint(2, 9)))
+        for _ in range(args.text_length // 6)
+    )[:args.text_length]
+    build = measure(lambda: BadWordsMatcher(words), repeat=3)
+    matcher = BadWordsMatcher(words)
+    assert {word for _, word in matcher.find_all(text)} == set(
+        loop_search(words, text)
+    )
+    loop = measure(lambda: loop_search(words, text), args.repeat)
+    automaton = measure(lambda: matcher.find_all(text), args.repeat)
+    print(f'Слов: {args.words}, длина текста: {len(text)}')
+    print(f'Сборка автомата: {build:.1f} мс')
+    print(f'Цикл по словам:  {loop:.3f} мс')
+    print(f'Автомат:         {automaton:.3f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Поиск по индексу FTS5 против icontains по тексту новостей.
+
+Запуск: python -m news.benchmarks.search --rows 1000000
+"""
+import argparse
+import random
+import time
+from itertools import accumulate
+
+from . import benchmark_database, measure
+
+VOCABULARY_SIZE = 50_000
+WORDS_PER_NEWS = 40
+QUERIES = ('новости', 'ре', 'новост экономик')
+
+
+def vocabulary(rng):
+    alphabet = 'абвгдежзиклмнопрстуфхцчшэюя'
+    words = {
+        ''.join(rng.choices(alphabet, k=rng.randint(4, 10)))
+        for _ in range(VOCABULARY_SIZE)
+    }
+    return sorted(words) + ['новость', 'новостями', 'экономика']
+
+
+def fill_news(rows, rng, batch_size=10_000):
+    from django.db import transaction
+    from news.models import News
+    words = vocabulary(rng)
+    # Распределение Ципфа: частые слова встречаются почти везде, редкие —
+    # в единицах новостей, как в настоящем корпусе.
+    weights = list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    rng.shuffle(words)
+
+    def sentence(length):
+        return ' '.join(rng.choices(words, cum_weights=weights, k=length))
+
+    with transaction.atomic():
+        for start in range(0, rows, batch_size):
+            News.objects.bulk_create(
+                News(
+                    title=sentence(5), text=sentence(WORDS_PER_NEWS)
+                )
+                for _ in range(start, min(start + batch_size, rows))
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    with benchmark_database():
+        from django.conf import settings
+        from news.models import News
+        from news.search import SearchPaginator, build_match, rebuild_index
+
+        started = time.perf_counter()
+        fill_news(args.rows, random.Random(0))
+        print(f'Вставка с триггерами: {time.perf_counter() - started:.1f} с')
+        started = time.perf_counter()
+        rebuild_index()
+        print(f'Перестройка индекса: {time.perf_counter() - started:.1f} с')
+        per_page = settings.NEWS_COUNT_ON_HOME_PAGE
+        print(f'Новостей: {args.rows}, на странице: {per_page}')
+        print(f'{"запрос":>16} {"FTS5, мс":>10} {"icontains, мс":>14}')
+        for query in QUERIES:
+            paginator = SearchPaginator(
+                News.objects.all(), per_page, build_match(query)
+            )
+            fts = measure(lambda: paginator.get_page(), args.repeat)
+            scan = measure(
+                lambda: list(
+                    News.objects.filter(text__icontains=query)[:per_page]
+                ),
+                max(1, args.repeat // 5),
+            )
+            print(f'{query:>16} {fts:>10.2f} {scan:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Читатели и писатели одновременно на news:detail в файле SQLite.
+
+Профиль «sqlite» — настройки SQLite по умолчанию: журнал отката, новое
+соединение на каждый запрос, DEFERRED-транзакции. Профиль «проект» —
+DATABASES из настроек, прагмы — в OPTIONS['init_command']. Каждый поток
+ведёт себя как поток WSGI-сервера: читатель открывает страницу новости,
+писатель оставляет под ней комментарий.
+
+Запуск: python -m news.benchmarks.sqlite_concurrency --readers 8 --writers 4
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from . import benchmark_database
+
+# Режим журнала хранится в файле базы, поэтому его возвращаем явно.
+SQLITE_DEFAULTS = {
+    'CONN_MAX_AGE': 0,
+    'OPTIONS': {
+        'init_command': 'PRAGMA journal_mode = DELETE;'
+                        'PRAGMA synchronous = FULL',
+    },
+}
+
+
+def worker(url, user, write, deadline, results):
+    from django.db import OperationalError, close_old_connections, connections
+    from django.test import Client
+
+    client = Client()
+    if user is not None:
+        client.force_login(user)
+    timings, errors = [], 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if write:
+                client.post(url, data={'text': 'Комментарий под нагрузкой'})
+            else:
+                client.get(url)
+        except OperationalError:
+            errors += 1
+        else:
+            timings.append((time.perf_counter() - started) * 1000)
+        # Тестовый клиент не закрывает соединения, сервер — закрывает.
+        close_old_connections()
+    connections.close_all()
+    results.append((write, timings, errors))
+
+
+def run(url, user, readers, writers, seconds):
+    results = []
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(
+            target=worker, args=(url, user, write, deadline, results)
+        )
+        for write in [False] * readers + [True] * writers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summary(results, write):
+    timings = [
+        timing for kind, items, _ in results if kind == write
+        for timing in items
+    ]
+    errors = sum(count for kind, _, count in results if kind == write)
+    if len(timings) < 2:
+        return len(timings), float('nan'), float('nan'), errors
+    cuts = statistics.quantiles(timings, n=100, method='inclusive')
+    return len(timings), cuts[49], cuts[98], errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory, benchmark_database(
+        Path(directory) / 'bench.sqlite3'
+    ):
+        from django.contrib.auth import get_user_model
+        from django.db import connections
+        from django.urls import reverse
+
+        from news.models import News
+
+        news = News.objects.create(title='Новость', text='Текст')
+        user = get_user_model().objects.create(username='Писатель')
+        url = reverse('news:detail', args=(news.pk,))
+        database = connections.settings['default']
+        profiles = {
+            'sqlite': SQLITE_DEFAULTS,
+            'проект': {
+                'CONN_MAX_AGE': database['CONN_MAX_AGE'],
+                'OPTIONS': database['OPTIONS'],
+            },
+        }
+        print(f'Читателей: {args.readers}, писателей: {args.writers}, '
+              f'секунд: {args.seconds:g}')
+        print(f'{"профиль":>8} {"":>8} {"в секунду":>10} {"p50, мс":>9} '
+              f'{"p99, мс":>9} {"ошибок":>7}')
+        for name, profile in profiles.items():
+            connections.close_all()
+            database.update(
+                CONN_MAX_AGE=profile['CONN_MAX_AGE'],
+                OPTIONS=profile['OPTIONS'],
+            )
+            results = run(url, user, args.readers, args.writers, args.seconds)
+            for kind, write in (('чтение', False), ('запись', True)):
+                count, p50, p99, errors = summary(results, write)
+                print(f'{name:>8} {kind:>8} {count / args.seconds:>10.1f} '
+                      f'{p50:>9.1f} {p99:>9.1f} {errors:>7}')
+        connections.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def reader_client(seeded):
+    users, _ = seeded
+    client = Client()
+    client.force_login(users[0])
+    return client
+
+
+def get(client, url):
+    """Холодный запрос: версии и фрагменты в кэше сброшены."""
+    cache.clear()
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+def test_news_list(benchmark, seeded):
+    client = Client()
+    url = reverse('news:home')
+    benchmark(lambda: get(client, url))
+
+
+@pytest.mark.parametrize('size', (1000, 10_000))
+def test_news_detail(benchmark, seeded, reader_client, size):
+    _, threads = seeded
+    url = reverse('news:detail', args=(threads[size].pk,))
+    benchmark(lambda: get(reader_client, url))
+
+
+def test_news_comment_post(benchmark, seeded, reader_client):
+    _, threads = seeded
+    url = reverse('news:detail', args=(threads[1000].pk,))
+
+    def post():
+        response = reader_client.post(url, data={'text': 'Текст замера'})
+        assert response.status_code == HTTPStatus.FOUND
+
+    benchmark(post)
@@ -0,0 +1,87 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+FEED_VERSION_KEY = 'news:feed-version'
+NEWS_VERSION_KEY = 'news:version:{pk}'
+COMMENT_VERSION_KEY = 'news:comment-version:{pk}'
+
+
+def get_versions(keys):
+    """
+    Версии данных под ключами keys за одно обращение к кэшу.
+
+    Версия — отметка времени последнего изменения, а не счётчик: после
+    вытеснения ключа из кэша новая версия не совпадёт ни с одной из старых.
+    Кэш общий для всех процессов сервера, см. news/checks.py.
+    """
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+    return {**versions, **missing}
+
+
+def get_version(key):
+    return get_versions([key])[key]
+
+
+def feed_version():
+    return get_version(FEED_VERSION_KEY)
+
+
+def news_version(news_id):
+    return get_version(NEWS_VERSION_KEY.format(pk=news_id))
+
+
+def attach_versions(*groups):
+    """
+    Проставляет объектам атрибут cache_version для кэша фрагментов.
+
+    groups — пары (объекты, шаблон ключа версии), версии всех объектов
+    читаются одним get_many.
+    """
+    keyed = [
+        (obj, key_template.format(pk=obj.pk))
+        for objects, key_template in groups for obj in objects
+    ]
+    versions = get_versions([key for _, key in keyed])
+    for obj, key in keyed:
+        obj.cache_version = versions[key]
+
+
+def bump_versions(*keys):
+    """
+    Отмечает изменение данных под ключами keys.
+
+    Версия меняется сразу и ещё раз после коммита: ответ, собранный
+    между ними по старым данным, не останется с новой версией.
+    """
+    def bump():
+        now = time.time_ns()
+        cache.set_many(dict.fromkeys(keys, now), None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def bump_news(news_id):
+    """Изменилась новость: устарели её страница и лента."""
+    bump_versions(FEED_VERSION_KEY, NEWS_VERSION_KEY.format(pk=news_id))
+
+
+def bump_comment(comment):
+    """Изменился комментарий: устарели он сам, его новость и лента."""
+    bump_versions(
+        FEED_VERSION_KEY,
+        NEWS_VERSION_KEY.format(pk=comment.news_id),
+        COMMENT_VERSION_KEY.format(pk=comment.pk),
+    )
+
+
+def bump_comments(comments):
+    """Пачка новых комментариев: устарели их новости и лента."""
+    bump_versions(FEED_VERSION_KEY, *{
+        NEWS_VERSION_KEY.format(pk=comment.news_id) for comment in comments
+    })
@@ -0,0 +1,15 @@
+from django.core.checks import register
+
+from ya_common.caching import process_local_cache_errors
+
+
+@register()
+def shared_cache(app_configs, **kwargs):
+    """
+    Версии страниц хранятся в кэше по умолчанию и должны быть общими.
+
+    Из них собираются ETag и ключи кэша фрагментов. С кэшем в памяти
+    процесса правка, сделанная одним воркером, не меняет версию в
+    другом, и тот отвечает 304 или фрагментом со старыми данными.
+    """
+    return process_local_cache_errors('news.E001')
@@ -0,0 +1,90 @@
+import hashlib
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .caching import feed_version, news_version
+from .models import Comment, News
+
+
+def newest_comment(comments):
+    # created проставляется auto_now_add, поэтому самый свежий комментарий
+    # — с наибольшим id, и он находится по индексу без сортировки.
+    return Subquery(comments.order_by('-pk').values('created')[:1])
+
+
+def _state_query(pk):
+    if pk is None:
+        news = News.objects.all()
+        comments = Comment.objects.all()
+    else:
+        news = News.objects.filter(pk=pk)
+        comments = Comment.objects.filter(news=OuterRef('pk'))
+    return news.values('date').annotate(
+        last_comment=newest_comment(comments)
+    )
+
+
+def _version(pk):
+    # Версия читается до дат: если страница изменится между двумя
+    # чтениями, новая версия не попадёт в пару со старыми датами.
+    return feed_version() if pk is None else news_version(pk)
+
+
+def _remember_state(request, version, row):
+    request._news_page_state = row and (
+        row['date'], row['last_comment'], version
+    )
+    return request._news_page_state
+
+
+def page_state(request, pk=None):
+    """
+    Дата свежей новости, время свежего комментария и версия страницы.
+
+    Даты берутся одним запросом по индексам и запоминаются на запросе,
+    чтобы ETag и Last-Modified не ходили в базу дважды. Для ленты pk
+    не передаётся, для страницы новости состояние считается по ней одной.
+    """
+    if not hasattr(request, '_news_page_state'):
+        version = _version(pk)
+        _remember_state(request, version, _state_query(pk).first())
+    return request._news_page_state
+
+
+async def apage_state(request, pk=None):
+    """
+    То же, что page_state, для асинхронных представлений.
+
+    Вызывается до condition, чтобы ETag и Last-Modified взяли готовое
+    состояние и не обращались к базе из цикла событий.
+    """
+    if not hasattr(request, '_news_page_state'):
+        version = _version(pk)
+        _remember_state(request, version, await _state_query(pk).afirst())
+    return request._news_page_state
+
+
+def news_etag(request, pk=None):
+    """Тег версии страницы; у вошедшего пользователя он свой."""
+    state = page_state(request, pk)
+    if state is None:
+        return None
+    parts = [*state]
+    if request.user.is_authenticated:
+        parts += [request.user.pk, request.META.get('CSRF_COOKIE')]
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def news_last_modified(request, pk=None):
+    state = page_state(request, pk)
+    if state is None:
+        return None
+    date, last_comment, version = state
+    stamps = [datetime.fromtimestamp(version / 1e9, tz=dt_timezone.utc)]
+    if date is not None:
+        stamps.append(timezone.make_aware(datetime.combine(date, time.min)))
+    if last_comment is not None:
+        stamps.append(last_comment)
+    return max(stamps)
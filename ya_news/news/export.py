@@ -0,0 +1,112 @@
+"""
+Потоковая выгрузка новостей с комментариями в JSON Lines и CSV.
+
+Новости обходятся по id пачками, комментарии к пачке выбираются одним
+запросом по индексу (news, created, id) и читаются через iterator(). Всё
+отдаётся генераторами: в памяти пачка новостей и комментарии одной
+новости, а сжатие gzip идёт по мере выдачи строк.
+"""
+import csv
+import json
+import zlib
+from itertools import groupby
+from operator import itemgetter
+
+from .models import Comment, News
+
+BATCH_SIZE = 500
+COMMENT_CHUNK_SIZE = 2000
+FORMATS = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+NEWS_FIELDS = ('id', 'title', 'text', 'date', 'comments_count')
+COMMENT_FIELDS = ('id', 'author', 'text', 'created')
+CSV_HEADER = (
+    *(f'news_{field}' for field in NEWS_FIELDS),
+    *(f'comment_{field}' for field in COMMENT_FIELDS),
+)
+
+
+def news_threads(batch_size=BATCH_SIZE, chunk_size=COMMENT_CHUNK_SIZE):
+    """
+    Пары (новость, итератор её комментариев) по возрастанию id.
+
+    Комментарии пачки новостей приходят из базы по chunk_size строк, а
+    не списком на всю пачку. Итератор комментариев действителен, пока
+    не запрошена следующая новость.
+    """
+    last_id = 0
+    while True:
+        batch = list(
+            News.objects.filter(pk__gt=last_id).order_by('pk').values(
+                *NEWS_FIELDS
+            )[:batch_size]
+        )
+        if not batch:
+            return
+        last_id = batch[-1]['id']
+        comments = Comment.objects.filter(
+            news_id__in=[news['id'] for news in batch]
+        ).order_by('news_id', 'created', 'id').values_list(
+            'news_id', 'id', 'author__username', 'text', 'created'
+        ).iterator(chunk_size=chunk_size)
+        threads = groupby(comments, key=itemgetter(0))
+        news_id, thread = next(threads, (None, ()))
+        for news in batch:
+            if news['id'] != news_id:
+                yield news, iter(())
+                continue
+            yield news, (
+                dict(zip(COMMENT_FIELDS, comment)) for _, *comment in thread
+            )
+            news_id, thread = next(threads, (None, ()))
+
+
+def _default(value):
+    return value.isoformat()
+
+
+def jsonl_chunks(threads):
+    """Новость с её комментариями — одна строка JSON."""
+    for news, comments in threads:
+        news['comments'] = list(comments)
+        yield json.dumps(news, ensure_ascii=False, default=_default) + '\n'
+
+
+class _Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(threads):
+    """Строка на комментарий; новость без комментариев — одна строка."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    empty = ('',) * len(COMMENT_FIELDS)
+    for news, comments in threads:
+        head = [news[field] for field in NEWS_FIELDS]
+        lines = [
+            writer.writerow(
+                [*head, *(comment[field] for field in COMMENT_FIELDS)]
+            )
+            for comment in comments
+        ]
+        yield ''.join(lines) or writer.writerow([*head, *empty])
+
+
+def export_chunks(file_format, batch_size=BATCH_SIZE):
+    encode = csv_chunks if file_format == 'csv' else jsonl_chunks
+    return encode(news_threads(batch_size))
+
+
+def gzip_chunks(chunks):
+    """Сжимает поток строк в gzip по мере его выдачи."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
@@ -2,12 +2,8 @@ from django.forms import ModelForm
 from django.core.exceptions import ValidationError
 
 from .models import Comment
+from .profanity import get_matcher
 
-BAD_WORDS = (
-    'редиска',
-    'негодяй',
-    # Дополните список на своё усмотрение.
-)
 WARNING = 'Не ругайтесь!'
 
 
@@ -18,10 +14,13 @@ class CommentForm(ModelForm):
         fields = ('text',)
 
     def clean_text(self):
-        """Не позволяем ругаться в комментариях."""
+        """
+        Не позволяем ругаться в комментариях.
+
+        Список запрещённых слов задаётся в settings.BAD_WORDS и
+        settings.BAD_WORDS_FILE.
+        """
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        if get_matcher().find_all(text):
+            raise ValidationError(WARNING)
         return text
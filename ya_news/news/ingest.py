@@ -0,0 +1,176 @@
+"""
+Отложенная запись комментариев при COMMENT_WRITE_MODE = 'queue'.
+
+Проверенный комментарий уходит в очередь процесса, и ответ с редиректом
+не ждёт записи. Фоновый поток собирает комментарии в пачки до
+COMMENT_BATCH_SIZE штук или на COMMENT_FLUSH_INTERVAL секунд и пишет
+каждую одной транзакцией. При штатной остановке процесса очередь
+дописывается; при аварийной ещё не записанные комментарии теряются,
+поэтому режим по умолчанию — 'sync', запись до ответа.
+
+Кука read_primary_until ставится вместе с редиректом, то есть до
+записи: она направляет чтения автора в основную базу, но комментария
+там может ещё не быть. Открыв страницу раньше, чем пройдёт
+COMMENT_FLUSH_INTERVAL, автор не увидит свой комментарий до следующей
+загрузки. Режим 'queue' этим и платит за ответ без ожидания записи.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections, transaction
+from django.db.models.base import ModelState
+from django.dispatch import receiver
+
+from .caching import bump_comments
+from .models import Comment, News
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+QUEUE_SETTINGS = {
+    'COMMENT_WRITE_MODE', 'COMMENT_QUEUE_SIZE',
+    'COMMENT_BATCH_SIZE', 'COMMENT_FLUSH_INTERVAL',
+}
+
+
+def write_comments(comments):
+    """Пачка комментариев и сдвиг счётчиков новостей одной транзакцией."""
+    with transaction.atomic():
+        Comment.objects.bulk_create(comments)
+        counts = Counter(comment.news_id for comment in comments)
+        for news_id, count in counts.items():
+            News.objects.filter(pk=news_id).change_comments_count(count)
+        bump_comments(comments)
+
+
+class CommentQueue:
+    """Очередь комментариев с одним пишущим потоком."""
+
+    def __init__(self, maxsize, batch_size, interval):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.Queue()
+        # Места считаются до записи, а не до выборки из очереди: так в
+        # памяти не больше maxsize комментариев, включая собираемую пачку.
+        self._slots = threading.Semaphore(maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def put(self, comment):
+        """Ставит комментарий в очередь; False, если очередь полна."""
+        if not self._slots.acquire(blocking=False):
+            return False
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='comment-writer', daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.shutdown)
+        self._queue.put(comment)
+        return True
+
+    def shutdown(self, timeout=None):
+        """Дописывает всё, что есть в очереди, и останавливает поток."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        atexit.unregister(self.shutdown)
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _run(self):
+        try:
+            stop = False
+            while not stop:
+                batch, stop = self._collect()
+                if batch:
+                    self._write(batch)
+                for _ in batch:
+                    self._slots.release()
+        finally:
+            connections.close_all()
+
+    def _collect(self):
+        """Пачка до batch_size комментариев или до конца интервала."""
+        item = self._queue.get()
+        deadline = time.monotonic() + self.interval
+        batch = []
+        while item is not _STOP:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, False
+            try:
+                item = self._queue.get(
+                    timeout=max(0, deadline - time.monotonic())
+                )
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _write(self, batch):
+        try:
+            write_comments(batch)
+        except Exception:
+            # Пачку не записать целиком, например из-за удалённой новости:
+            # пишем по одному, чтобы потерять только сбойные комментарии.
+            logger.exception('Не удалось записать пачку комментариев.')
+            for comment in batch:
+                # bulk_create успел раздать id, но транзакция откатилась:
+                # повтор с ними занял бы id, которые уже могла взять база.
+                comment.pk = None
+                comment._state = ModelState()
+                try:
+                    write_comments([comment])
+                except Exception:
+                    logger.exception('Комментарий потерян: %r', comment)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = CommentQueue(
+                settings.COMMENT_QUEUE_SIZE,
+                settings.COMMENT_BATCH_SIZE,
+                settings.COMMENT_FLUSH_INTERVAL,
+            )
+        return _queue
+
+
+def enqueue(comment):
+    """
+    Отдаёт комментарий фоновой записи.
+
+    False — комментарий нужно записать сразу: включён режим 'sync'
+    или очередь переполнена.
+    """
+    if settings.COMMENT_WRITE_MODE != 'queue':
+        return False
+    return get_queue().put(comment)
+
+
+def shutdown():
+    """Дописывает очередь; следующая запись поднимет новую."""
+    global _queue
+    with _queue_lock:
+        comment_queue, _queue = _queue, None
+    if comment_queue is not None:
+        comment_queue.shutdown()
+
+
+@receiver(setting_changed)
+def reset_on_setting_change(setting, **kwargs):
+    if setting in QUEUE_SETTINGS:
+        shutdown()
@@ -0,0 +1,67 @@
+"""
+Смесь запросов к YaNews для нагрузочного прогона load_test.py.
+
+Популярные новости запрашиваются чаще: новости ранжируются по числу
+комментариев и выбираются по закону Ципфа.
+"""
+from urllib.parse import urlencode
+
+from django.urls import reverse
+
+from ya_common.seeding import zipf_weights
+
+from .models import Comment, News
+
+SAMPLE_SIZE = 1000
+
+
+def request_mix(rng):
+    """
+    Пары (вес, фабрика запроса) для URL из news.urls.
+
+    Фабрика возвращает имя URL, путь и пользователя, от имени которого
+    идёт запрос (None — аноним).
+    """
+    popular = list(
+        News.objects.order_by('-comments_count').values_list(
+            'id', 'title'
+        )[:SAMPLE_SIZE]
+    )
+    weights = zipf_weights(len(popular))
+    comments = list(
+        Comment.objects.select_related('author').order_by('-id')[:SAMPLE_SIZE]
+    )
+
+    def pick_news():
+        return rng.choices(popular, cum_weights=weights)[0]
+
+    def detail():
+        return 'news:detail', reverse('news:detail', args=(
+            pick_news()[0],
+        )), None
+
+    def comments_page():
+        return 'news:comments', reverse('news:comments', args=(
+            pick_news()[0],
+        )), None
+
+    def search():
+        word = rng.choice(pick_news()[1].split())
+        query = urlencode({'q': word})
+        return 'news:search', f'{reverse("news:search")}?{query}', None
+
+    def comment_view(name):
+        def build():
+            comment = rng.choice(comments)
+            return name, reverse(name, args=(comment.pk,)), comment.author
+        return build
+
+    mix = [(40, lambda: ('news:home', reverse('news:home'), None))]
+    if popular:
+        mix += [(30, detail), (10, comments_page), (10, search)]
+    if comments:
+        mix += [
+            (5, comment_view('news:edit')),
+            (5, comment_view('news:delete')),
+        ]
+    return mix
@@ -0,0 +1,41 @@
+import sys
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+
+from news.export import BATCH_SIZE, FORMATS, export_chunks, gzip_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает новости с комментариями в JSON Lines или CSV, обходя '
+        'новости пачками по id.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default='-', help='Файл или - для stdout.'
+        )
+        parser.add_argument('--format', choices=FORMATS, default='jsonl')
+        parser.add_argument(
+            '--gzip', action='store_true', help='Сжимать на лету.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        chunks = export_chunks(options['format'], options['batch_size'])
+        path = options['output']
+        if options['gzip']:
+            chunks = gzip_chunks(chunks)
+            target = (
+                nullcontext(sys.stdout.buffer) if path == '-'
+                else open(path, 'wb')
+            )
+        else:
+            target = (
+                nullcontext(self.stdout) if path == '-'
+                else open(path, 'w', encoding='utf-8', newline='')
+            )
+        with target as stream:
+            for chunk in chunks:
+                stream.write(chunk)
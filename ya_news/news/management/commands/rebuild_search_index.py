@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from news.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает полнотекстовый индекс новостей, например после '
+        'загрузки данных в обход триггеров.'
+    )
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
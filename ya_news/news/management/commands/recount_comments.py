@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованный счётчик комментариев у новостей.'
+
+    def handle(self, *args, **options):
+        updated = News.objects.recount_comments()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено новостей: {updated}')
+        )
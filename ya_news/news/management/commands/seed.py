@@ -0,0 +1,35 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.seeding import seed_news
+from ya_common.seeding import PASSWORD, seed_users
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, новостями и '
+        f'комментариями. Пароль пользователей: {PASSWORD}.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--news', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=100_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+        users = seed_users(options['users'])
+        news, comments = seed_news(
+            rng, users, options['news'], options['comments'],
+            options['batch_size'], self.stderr.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано пользователей: {len(users)}, новостей: {news}, '
+            f'комментариев: {comments} за '
+            f'{time.perf_counter() - started:.1f} с'
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-18 13:14
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_count(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    Comment = apps.get_model('news', 'Comment')
+    comments = Comment.objects.filter(
+        news=models.OuterRef('pk')
+    ).order_by().values('news').annotate(
+        count=models.Count('pk')
+    ).values('count')
+    News.objects.update(
+        comments_count=Coalesce(models.Subquery(comments), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
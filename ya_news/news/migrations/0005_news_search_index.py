@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from ya_common.fts import fts5_index
+
+
+class Migration(migrations.Migration):
+    """Полнотекстовый индекс FTS5 над заголовком и текстом новости."""
+
+    dependencies = [
+        ('news', '0004_comment_news_created_id_idx'),
+    ]
+
+    operations = [
+        fts5_index('news_news', ('title', 'text')),
+    ]
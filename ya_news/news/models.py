@@ -1,16 +1,58 @@
 from datetime import datetime
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+
+from .caching import FEED_VERSION_KEY, NEWS_VERSION_KEY, bump_versions
+
+
+class NewsQuerySet(models.QuerySet):
+
+    def change_comments_count(self, delta):
+        """Сдвигает счётчик комментариев на delta одним UPDATE."""
+        return self.update(comments_count=models.F('comments_count') + delta)
+
+    def recount_comments(self):
+        """
+        Пересчитывает счётчик комментариев по таблице комментариев.
+
+        Обновляются только разошедшиеся счётчики, и у этих новостей, как
+        и у ленты, меняются версии кэша. Возвращает число таких новостей.
+        """
+        comments = Comment.objects.filter(
+            news=models.OuterRef('pk')
+        ).order_by().values('news').annotate(
+            count=models.Count('pk')
+        ).values('count')
+        actual = Coalesce(models.Subquery(comments), 0)
+        stale = self.alias(actual=actual).exclude(
+            comments_count=models.F('actual')
+        )
+        with transaction.atomic():
+            ids = list(stale.values_list('pk', flat=True))
+            if not ids:
+                return 0
+            updated = stale.update(comments_count=actual)
+            bump_versions(FEED_VERSION_KEY, *(
+                NEWS_VERSION_KEY.format(pk=pk) for pk in ids
+            ))
+        return updated
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = NewsQuerySet.as_manager()
 
     class Meta:
-        ordering = ('-date',)
+        ordering = ('-date', '-id')
+        indexes = (
+            models.Index(fields=('-date', '-id'), name='news_date_id_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -31,7 +73,13 @@ class Comment(models.Model):
     created = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ('created',)
+        ordering = ('created', 'id')
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='comment_news_created_id_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
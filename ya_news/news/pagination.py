@@ -0,0 +1,190 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import BadRequest, ValidationError
+from django.db.models import Q
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def _serialize(value):
+    # Даты храним в ISO без потери микросекунд, в отличие от
+    # DjangoJSONEncoder, иначе ключ на границе страницы сместится.
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(direction, values):
+    """Упаковывает направление и значения ключа в непрозрачный токен."""
+    payload = json.dumps(
+        [direction, [_serialize(value) for value in values]],
+        separators=(',', ':'),
+    )
+    return urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Распаковывает токен; на испорченный токен отвечаем 400."""
+    try:
+        payload = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, values = json.loads(payload)
+    except (BinasciiError, UnicodeDecodeError, ValueError, TypeError):
+        raise BadRequest('Некорректный курсор.')
+    if direction not in (NEXT, PREVIOUS) or not isinstance(values, list):
+        raise BadRequest('Некорректный курсор.')
+    return direction, values
+
+
+class KeysetPage:
+    """Страница выборки с токенами соседних страниц."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Постраничный вывод по ключу сортировки вместо OFFSET.
+
+    Сортировка берётся из queryset или Meta.ordering модели и должна
+    заканчиваться уникальным полем, иначе граница страницы неоднозначна.
+    Каждая страница — один запрос с LIMIT per_page + 1, время выборки
+    не зависит от номера страницы при наличии индекса по ключу.
+    """
+
+    def __init__(self, queryset, per_page, ordering=None):
+        self.ordering = tuple(
+            ordering
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+        )
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def get_page(self, cursor=None):
+        queryset, backwards, after = self._page_queryset(cursor)
+        return self._make_page(
+            list(queryset[:self.per_page + 1]), backwards, after
+        )
+
+    async def aget_page(self, cursor=None):
+        """То же, что get_page, через асинхронный ORM."""
+        queryset, backwards, after = self._page_queryset(cursor)
+        return self._make_page(
+            [obj async for obj in queryset[:self.per_page + 1].aiterator()],
+            backwards, after,
+        )
+
+    def _page_queryset(self, cursor):
+        direction, values = NEXT, None
+        if cursor:
+            direction, values = decode_cursor(cursor)
+            values = self._clean(values)
+        backwards = direction == PREVIOUS
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(self._invert(field) for field in ordering)
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(ordering, values))
+        return queryset, backwards, values is not None
+
+    def _clean(self, values):
+        """
+        Значения ключа из курсора, приведённые к типам полей.
+
+        Курсор приходит от клиента, поэтому подделанные значения должны
+        давать 400, а не ошибку в фильтре ORM.
+        """
+        if len(values) != len(self.ordering):
+            raise BadRequest('Некорректный курсор.')
+        meta = self.queryset.model._meta
+        cleaned = []
+        for field, value in zip(self.ordering, values):
+            try:
+                value = meta.get_field(field.lstrip('-')).to_python(value)
+            except (ValidationError, TypeError, ValueError):
+                raise BadRequest('Некорректный курсор.')
+            if value is None:
+                raise BadRequest('Некорректный курсор.')
+            cleaned.append(value)
+        return cleaned
+
+    def _make_page(self, object_list, backwards, after):
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if backwards:
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, after
+        next_cursor = previous_cursor = None
+        if object_list and has_next:
+            next_cursor = encode_cursor(NEXT, self._key(object_list[-1]))
+        if object_list and has_previous:
+            previous_cursor = encode_cursor(
+                PREVIOUS, self._key(object_list[0])
+            )
+        return KeysetPage(object_list, next_cursor, previous_cursor)
+
+    def _key(self, obj):
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _seek(ordering, values):
+        """
+        Условие «строго после ключа» в порядке ordering.
+
+        Ведущее поле дополнительно ограничено нестрогим сравнением, чтобы
+        SQLite мог взять диапазон по индексу, а не разворачивать OR.
+        """
+        lookups = [
+            (field.lstrip('-'), 'lt' if field.startswith('-') else 'gt')
+            for field in ordering
+        ]
+        leading_field, leading_lookup = lookups[0]
+        condition = Q()
+        for index, (field, lookup) in enumerate(lookups):
+            equal = {name: value for (name, _), value
+                     in zip(lookups[:index], values)}
+            condition |= Q(**equal, **{f'{field}__{lookup}': values[index]})
+        return Q(**{f'{leading_field}__{leading_lookup}e': values[0]}) & (
+            condition
+        )
+
+
+class KeysetPaginationMixin:
+    """Курсорная пагинация вместо номерной для ListView."""
+    cursor_kwarg = 'cursor'
+
+    def get_keyset_paginator(self, queryset, page_size):
+        return KeysetPaginator(queryset, page_size)
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_keyset_paginator(queryset, page_size)
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,118 @@
+import os
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class BadWordsMatcher:
+    """
+    Автомат Ахо — Корасик по списку запрещённых слов.
+
+    Строится один раз, после чего текст проверяется за один проход
+    независимо от длины списка: O(len(text) + число совпадений).
+    """
+
+    def __init__(self, words):
+        self.words = tuple(word.lower() for word in words if word)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for index, word in enumerate(self.words):
+            self._add(word, index)
+        self._link()
+
+    def _add(self, word, index):
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (index,)
+
+    def _link(self):
+        """Суффиксные ссылки обходом в ширину от корня."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] += self._output[fail]
+
+    def find_all(self, text):
+        """Все вхождения в виде пар (позиция начала, слово)."""
+        goto, fail, output = self._goto, self._fail, self._output
+        hits = []
+        state = 0
+        for position, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                word = self.words[index]
+                hits.append((position - len(word) + 1, word))
+        return hits
+
+
+_matcher = None
+_mtime = None
+
+
+def _file_mtime():
+    path = settings.BAD_WORDS_FILE
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_words():
+    """Слова из settings.BAD_WORDS и файла settings.BAD_WORDS_FILE."""
+    words = list(settings.BAD_WORDS)
+    if _file_mtime() is not None:
+        with open(settings.BAD_WORDS_FILE, encoding='utf-8') as file:
+            words.extend(line.strip() for line in file)
+    return words
+
+
+def reload_matcher(words=None):
+    """Пересобирает автомат, по умолчанию из load_words()."""
+    global _matcher, _mtime
+    # Время правки снимается до чтения файла: запись во время чтения
+    # вызовет ещё одну пересборку.
+    mtime = _file_mtime()
+    _matcher = BadWordsMatcher(load_words() if words is None else words)
+    _mtime = mtime
+    return _matcher
+
+
+def get_matcher():
+    """
+    Автомат, собранный при старте приложения.
+
+    Правка BAD_WORDS_FILE подхватывается без перезапуска: каждый процесс
+    сверяет время изменения файла и пересобирает автомат. Список
+    BAD_WORDS в settings.py меняется только с перезапуском.
+    """
+    if _matcher is None or _file_mtime() != _mtime:
+        return reload_matcher()
+    return _matcher
+
+
+@receiver(setting_changed)
+def reload_on_setting_change(setting, **kwargs):
+    if setting in ('BAD_WORDS', 'BAD_WORDS_FILE'):
+        reload_matcher()
@@ -1,78 +1,158 @@
+from copy import deepcopy
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 
 import pytest
 
 from django.conf import settings
-from django.test.client import Client
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 
 from news.models import Comment, News
+from news.pytest_tests.query_budget import QueryBudgetClient
+from ya_common.testing import SESSION_ENGINE, login
 
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
 
-@pytest.fixture(autouse=True)
-def news_batch():
-    """Создание тестовых новостей для главной страницы."""
+
+def seed_baseline():
+    """
+    Базовый набор данных, общий для всех тестов.
+
+    Строится один раз на сессию: каждый тест выполняется в транзакции,
+    откат которой возвращает базу ровно к этому состоянию.
+    """
+    User = get_user_model()
     News.objects.bulk_create(
         News(title=f'Новость {index}', text='Просто текст.',
              date=datetime.today() - timedelta(days=index))
         for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
     )
+    return SimpleNamespace(
+        news=News.objects.create(title='Заголовок', text='Текст'),
+        author=User.objects.create(username='Лев Толстой'),
+        reader=User.objects.create(username='Читатель простой'),
+    )
+
+
+@pytest.fixture(scope='session', autouse=True)
+def process_cache():
+    """
+    Кэш в памяти процесса вместо общего файлового.
+
+    У каждого процесса pytest, в том числе у шардов parallel_tests.py,
+    своя тестовая база, поэтому и версии страниц должны быть своими.
+    """
+    with override_settings(CACHES=TEST_CACHES):
+        yield
+
+
+@pytest.fixture(scope='session', autouse=True)
+def baseline(process_cache, django_db_setup, django_db_blocker):
+    """Создание тестовых новостей и пользователей на всю сессию."""
+    with django_db_blocker.unblock():
+        return seed_baseline()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def signed_cookie_sessions():
+    """Сессии тестовых клиентов не пишутся в базу."""
+    with override_settings(SESSION_ENGINE=SESSION_ENGINE):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Версии страниц в кэше не переживают откат базы после теста."""
+    cache.clear()
 
 
 @pytest.fixture
-def news():
-    """Создает тестовую новость."""
-    return News.objects.create(title='Заголовок', text='Текст')
+def news(baseline):
+    """Тестовая новость."""
+    return deepcopy(baseline.news)
 
 
 @pytest.fixture
-def author(django_user_model):
+def author(baseline):
     """Пользователь-автор."""
-    return django_user_model.objects.create(username='Лев Толстой')
+    return deepcopy(baseline.author)
 
 
 @pytest.fixture
-def author_client(author):
-    """Авторизованный клиент автора."""
-    client = Client()
-    client.force_login(author)
-    return client
+def reader(baseline):
+    """Пользователь-читатель."""
+    return deepcopy(baseline.reader)
 
 
 @pytest.fixture
-def reader(django_user_model):
-    """Пользователь-читатель."""
-    return django_user_model.objects.create(username='Читатель простой')
+def client():
+    """Анонимный клиент с проверкой бюджета SQL-запросов."""
+    return QueryBudgetClient()
+
+
+@pytest.fixture
+def author_client(author):
+    """Авторизованный клиент автора."""
+    return login(QueryBudgetClient(), author)
 
 
 @pytest.fixture
 def reader_client(reader):
     """Авторизованный клиент читателя."""
-    client = Client()
-    client.force_login(reader)
-    return client
+    return login(QueryBudgetClient(), reader)
+
+
+@pytest.fixture
+def editor_client(django_user_model):
+    """Авторизованный клиент сотрудника редакции."""
+    editor = django_user_model.objects.create(
+        username='Редактор', is_staff=True
+    )
+    return login(QueryBudgetClient(), editor)
 
 
 @pytest.fixture
 def comment(author, news):
     """Тестовый комментарий."""
-    return Comment.objects.create(
+    comment = Comment.objects.create(
         news=news,
         author=author,
         text='Текст комментария'
     )
+    News.objects.filter(pk=news.pk).change_comments_count(1)
+    return comment
 
 
 @pytest.fixture
 def multiple_comments(news, author):
     """Несколько комментариев с разными датами."""
     now = timezone.now()
-    for index in range(10):
-        comment = Comment.objects.create(
-            news=news, author=author, text=f'Tекст {index}')
+    comments = Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Tекст {index}')
+        for index in range(10)
+    )
+    # auto_now_add перезаписывает created при вставке, поэтому даты
+    # проставляем вторым запросом.
+    for index, comment in enumerate(comments):
         comment.created = now + timedelta(days=index)
-        comment.save()
+    Comment.objects.bulk_update(comments, ('created',))
+
+
+@pytest.fixture
+def comments_batch(news, author):
+    """Комментариев на одну страницу больше, чем помещается в ответ."""
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(settings.COMMENTS_COUNT_ON_PAGE + 1)
+    )
 
 
 @pytest.fixture
@@ -80,11 +160,26 @@ def home_url():
     return reverse('news:home')
 
 
+@pytest.fixture
+def search_url():
+    return reverse('news:search')
+
+
+@pytest.fixture
+def export_url():
+    return reverse('news:export')
+
+
 @pytest.fixture
 def detail_url(news):
     return reverse('news:detail', args=(news.id,))
 
 
+@pytest.fixture
+def comments_url(news):
+    return reverse('news:comments', args=(news.id,))
+
+
 @pytest.fixture
 def url_to_comments(detail_url):
     """URL с якорем к комментариям."""
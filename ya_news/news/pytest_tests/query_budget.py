@@ -0,0 +1,23 @@
+from ya_common import testing
+
+# Сколько SQL-запросов может выполнить страница за один HTTP-запрос.
+# Считаются все запросы, включая чтение пользователя; сессии в тестах
+# хранятся в подписанной куке и запросов не дают. Ленте и новости нужен
+# ещё один запрос на даты для ETag и Last-Modified. Бюджеты POST включают
+# SAVEPOINT и RELEASE, которыми atomic отмечается внутри тестовой транзакции.
+QUERY_BUDGETS = {
+    'news:home': {'GET': 3},
+    'news:detail': {'GET': 4, 'POST': 6},
+    'news:search': {'GET': 3},
+    # Выгрузка читает базу уже при отдаче тела, здесь — только пользователь.
+    'news:export': {'GET': 1},
+    'news:comments': {'GET': 2},
+    'news:edit': {'GET': 2, 'POST': 3},
+    'news:delete': {'GET': 2, 'POST': 6},
+}
+
+
+class QueryBudgetClient(testing.QueryBudgetClient):
+    """Тестовый клиент с бюджетами страниц YaNews."""
+
+    budgets = QUERY_BUDGETS
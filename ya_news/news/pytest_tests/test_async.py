@@ -0,0 +1,49 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def async_views(settings):
+    """Маршруты с асинхронными лентой и страницей новости."""
+    settings.ROOT_URLCONF = 'yanews.async_urls'
+
+
+@pytest.fixture
+def sync_pages(client, home_url, detail_url, multiple_comments):
+    """Ответы синхронных представлений для сравнения."""
+    return {url: client.get(url).content for url in (home_url, detail_url)}
+
+
+@pytest.mark.parametrize('name', ('home_url', 'detail_url'))
+def test_async_pages_match_sync(
+    client, sync_pages, async_views, name, request
+):
+    """Асинхронные представления отдают ту же страницу."""
+    url = request.getfixturevalue(name)
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == sync_pages[url]
+
+
+def test_async_not_modified(client, detail_url, async_views):
+    """Асинхронная страница поддерживает ETag, как и синхронная."""
+    etag = client.get(detail_url)['ETag']
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_async_detail_missing(client, async_views):
+    """Несуществующая новость отвечает 404."""
+    response = client.get(reverse('news:detail', args=(0,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_async_detail_form(author_client, detail_url, async_views):
+    """Вошедший пользователь видит форму и может оставить комментарий."""
+    assert 'form' in author_client.get(detail_url).context
+    response = author_client.post(detail_url, data={'text': 'Комментарий'})
+    assert response.status_code == HTTPStatus.FOUND
@@ -0,0 +1,35 @@
+import random
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F
+
+from news.load import request_mix
+from news.models import Comment, News
+from news.pytest_tests.query_budget import QueryBudgetClient
+from ya_common.testing import login
+
+pytestmark = pytest.mark.django_db
+
+
+def test_seed_keeps_comment_counts(capsys):
+    """Счётчики комментариев у сгенерированных новостей сходятся."""
+    news_before = News.objects.count()
+    call_command('seed', users=3, news=20, comments=200)
+    capsys.readouterr()
+    assert News.objects.count() == news_before + 20
+    assert Comment.objects.count() == 200
+    assert not News.objects.annotate(
+        real_count=Count('comment')
+    ).exclude(comments_count=F('real_count')).exists()
+
+
+def test_request_mix_pages_respond(comment):
+    """Каждый запрос из смеси нагрузки открывается без ошибок."""
+    for _, build in request_mix(random.Random(0)):
+        name, url, user = build()
+        client = QueryBudgetClient()
+        if user is not None:
+            login(client, user)
+        assert client.get(url).status_code == HTTPStatus.OK, name
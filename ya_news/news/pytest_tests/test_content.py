@@ -1,14 +1,21 @@
+from http import HTTPStatus
+
 import pytest
 from django.conf import settings
+from pytest_lazyfixture import lazy_fixture as lf
 
 from news.forms import CommentForm
+from news.models import News
+from news.pagination import NEXT, encode_cursor
+from news.search import build_match, rebuild_index
 
 pytestmark = pytest.mark.django_db
 
 
 def test_news_count(client, home_url):
     """Проверка количества новостей на главной странице."""
-    assert client.get(home_url).context['object_list'].count(
+    assert len(
+        client.get(home_url).context['object_list']
     ) == settings.NEWS_COUNT_ON_HOME_PAGE
 
 
@@ -21,6 +28,55 @@ def test_news_order(client, home_url):
     assert all_dates == sorted(all_dates, reverse=True)
 
 
+def test_news_pages_cover_feed(client, home_url):
+    """Курсор проходит всю ленту без пропусков и повторов."""
+    seen, cursor = [], None
+    while True:
+        page = client.get(
+            home_url, {'cursor': cursor} if cursor else {}
+        ).context['page_obj']
+        seen.extend(news_item.pk for news_item in page)
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+    assert seen == list(News.objects.values_list('pk', flat=True))
+
+
+def test_news_previous_page(client, home_url):
+    """Курсор назад возвращает предыдущую страницу целиком."""
+    first_page = client.get(home_url).context['page_obj']
+    second_page = client.get(
+        home_url, {'cursor': first_page.next_cursor}
+    ).context['page_obj']
+    assert second_page.has_previous()
+    previous_page = client.get(
+        home_url, {'cursor': second_page.previous_cursor}
+    ).context['page_obj']
+    assert previous_page.object_list == first_page.object_list
+    assert not previous_page.has_previous()
+
+
+def test_broken_cursor(client, home_url):
+    """Испорченный курсор даёт 400, а не 500."""
+    response = client.get(home_url, {'cursor': 'не-курсор'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize('values', (
+    ['garbage', 1],
+    [None, None],
+    [{'a': 1}, 1],
+    ['2020-01-01', 'x'],
+    [[1], 2],
+    [1],
+))
+@pytest.mark.parametrize('url', (lf('home_url'), lf('comments_url')))
+def test_tampered_cursor(client, url, values):
+    """Курсор с подделанными значениями ключа даёт 400."""
+    response = client.get(url, {'cursor': encode_cursor(NEXT, values)})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
 def test_comments_order(client, detail_url):
     """Проверка сортировки комментариев от старых к новым."""
     assert 'news' in client.get(detail_url).context
@@ -30,6 +86,29 @@ def test_comments_order(client, detail_url):
     assert list(comments_dates) == sorted(comments_dates)
 
 
+def test_detail_renders_first_comments_page(
+        client, detail_url, comments_batch
+):
+    """На странице новости только первая страница комментариев."""
+    comments = client.get(detail_url).context['comments']
+    assert len(comments) == settings.COMMENTS_COUNT_ON_PAGE
+    assert comments.has_next()
+
+
+def test_comments_fragment_continues_thread(
+        client, news, detail_url, comments_url, comments_batch
+):
+    """Фрагмент отдаёт следующую страницу комментариев по курсору."""
+    first_page = client.get(detail_url).context['comments']
+    response = client.get(comments_url, {'cursor': first_page.next_cursor})
+    assert response.status_code == HTTPStatus.OK
+    pages = list(first_page) + list(response.context['page_obj'])
+    assert [comment.pk for comment in pages] == list(
+        news.comment_set.values_list('pk', flat=True)
+    )
+    assert not response.context['page_obj'].has_next()
+
+
 def test_anonymous_client_has_no_form(client, detail_url):
     """Проверка отсутствия формы комментария для анонима."""
     assert 'form' not in client.get(detail_url).context
@@ -39,3 +118,106 @@ def test_authorized_client_has_form(author_client, detail_url):
     """Проверка наличия формы комментария для авторизованного."""
     assert isinstance(author_client.get(
         detail_url).context.get('form'), CommentForm)
+
+
+def test_home_page_single_query(
+        client, home_url, news, multiple_comments, django_assert_num_queries
+):
+    """
+    Главная страница не загружает комментарии.
+
+    Один запрос — даты для ETag и Last-Modified, второй — сама лента.
+    """
+    News.objects.recount_comments()
+    with django_assert_num_queries(2):
+        response = client.get(home_url)
+    assert 'Комментариев: 10' in response.content.decode()
+
+
+def test_fragments_follow_changes(client, comment, detail_url, news):
+    """Правка новости и комментария сразу видна сквозь кэш фрагментов."""
+    client.get(detail_url)
+    comment.text = 'Исправленный комментарий'
+    comment.save()
+    response = client.get(detail_url)
+    assert 'Исправленный комментарий' in response.content.decode()
+    news.title = 'Новый заголовок'
+    news.save()
+    assert 'Новый заголовок' in client.get(detail_url).content.decode()
+
+
+def test_fragments_not_shared_between_users(
+        author_client, reader_client, comment, detail_url, edit_url
+):
+    """Ссылки автора не попадают в закэшированный фрагмент комментария."""
+    edit_link = f'href="{edit_url}"'
+    assert edit_link not in reader_client.get(detail_url).content.decode()
+    assert edit_link in author_client.get(detail_url).content.decode()
+    assert edit_link not in reader_client.get(detail_url).content.decode()
+
+
+def search(client, search_url, query, cursor=None):
+    params = {'q': query}
+    if cursor:
+        params['cursor'] = cursor
+    return client.get(search_url, params).context['page_obj']
+
+
+def test_search_word_forms(client, search_url, news):
+    """Русские словоформы и «ё» находят одну и ту же новость."""
+    news.title = 'Зелёные ёлки в новостях'
+    news.save()
+    for query in ('зеленая елка', 'ЁЛКАМИ', 'зелён'):
+        assert list(search(client, search_url, query)) == [news]
+
+
+def test_search_ranked_and_paged(client, search_url, news):
+    """Лучшее совпадение первым, курсор проходит всю выдачу без повторов."""
+    news.title = 'Новость новость новость'
+    news.save()
+    page = search(client, search_url, 'новости')
+    assert page.object_list[0] == news
+    found = list(page)
+    while page.has_next():
+        page = search(client, search_url, 'новости', page.next_cursor)
+        found.extend(page)
+    assert len(found) == len(set(found)) == News.objects.filter(
+        title__startswith='Новость'
+    ).count()
+
+
+@pytest.mark.parametrize('values', (
+    [1.0, 10 ** 30],
+    [1.0, -1],
+    [1.0, True],
+    [True, 1],
+    [float('nan'), 1],
+    [float('inf'), 1],
+    [10 ** 400, 1],
+    ['1.0', 1],
+    [1.0],
+))
+def test_search_tampered_cursor(client, search_url, values):
+    """Подделанный курсор поиска даёт 400, а не ошибку драйвера."""
+    response = client.get(
+        search_url, {'q': 'новости', 'cursor': encode_cursor(NEXT, values)}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_search_index_follows_changes(client, search_url, news):
+    """Индекс обновляется при правке и удалении, в том числе через update."""
+    News.objects.filter(pk=news.pk).update(text='Уникальное слово')
+    assert list(search(client, search_url, 'уникальное')) == [news]
+    news.delete()
+    assert not search(client, search_url, 'уникальное')
+    rebuild_index()
+    assert not search(client, search_url, 'уникальное')
+
+
+def test_search_ignores_query_syntax(client, search_url):
+    """Операторы FTS5 во вводе не ломают запрос."""
+    assert build_match('NEAR(" OR *') == '"near"* "or"*'
+    assert client.get(search_url, {'q': '") OR *'}).status_code == (
+        HTTPStatus.OK
+    )
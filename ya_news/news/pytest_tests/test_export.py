@@ -0,0 +1,85 @@
+import csv
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from news.export import export_chunks, jsonl_chunks, news_threads
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+def content(response):
+    return b''.join(response.streaming_content)
+
+
+def test_export_requires_staff(client, reader_client, export_url):
+    """Выгрузка доступна только сотрудникам."""
+    assert client.get(export_url).status_code == HTTPStatus.FOUND
+    assert reader_client.get(export_url).status_code == HTTPStatus.FORBIDDEN
+
+
+def test_export_jsonl(editor_client, export_url, multiple_comments, news):
+    """Каждая новость — строка JSON с комментариями по порядку."""
+    response = editor_client.get(export_url)
+    assert response.streaming
+    rows = [json.loads(line) for line in content(response).splitlines()]
+    assert [row['id'] for row in rows] == sorted(
+        News.objects.values_list('id', flat=True)
+    )
+    thread = next(row['comments'] for row in rows if row['id'] == news.id)
+    assert [comment['id'] for comment in thread] == list(
+        news.comment_set.values_list('id', flat=True)
+    )
+
+
+def test_export_csv(editor_client, export_url, multiple_comments):
+    """Строка на комментарий и по строке на новость без комментариев."""
+    response = editor_client.get(export_url, {'format': 'csv'})
+    rows = list(csv.DictReader(io.StringIO(content(response).decode())))
+    commented = Comment.objects.values('news').distinct().count()
+    assert len(rows) == (
+        Comment.objects.count() + News.objects.count() - commented
+    )
+
+
+def test_export_gzip(editor_client, export_url, multiple_comments):
+    """По Accept-Encoding ответ сжимается, содержимое то же."""
+    plain = content(editor_client.get(export_url))
+    response = editor_client.get(export_url, HTTP_ACCEPT_ENCODING='gzip')
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(content(response)) == plain
+
+
+def test_export_queries_per_batch(multiple_comments):
+    """На пачку новостей — два запроса, без N+1 по комментариям."""
+    batches = -(-News.objects.count() // 5)
+    with CaptureQueriesContext(connection) as context:
+        list(export_chunks('jsonl', batch_size=5))
+    assert len(context.captured_queries) == 2 * batches + 1
+
+
+def test_export_comment_chunks(author, multiple_comments):
+    """Комментарии, читаемые мелкими порциями, не теряются на стыках."""
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Текст {index}')
+        for news in News.objects.order_by('pk')[1:8:2] for index in range(3)
+    )
+    assert ''.join(jsonl_chunks(news_threads(5, chunk_size=1))) == ''.join(
+        export_chunks('jsonl')
+    )
+
+
+def test_export_command_gzip(tmp_path, editor_client, export_url, comment):
+    """Команда пишет в файл то же, что отдаёт страница."""
+    path = tmp_path / 'news.csv.gz'
+    call_command('export_news', output=str(path), format='csv', gzip=True)
+    assert gzip.decompress(path.read_bytes()) == content(
+        editor_client.get(export_url, {'format': 'csv'})
+    )
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management.color import no_style
+from django.db import connection
+
+from news import ingest
+from news.models import Comment, News
+from news.pytest_tests.conftest import seed_baseline
+
+# Очередь пишет из своего потока и своим соединением, поэтому тесты
+# работают без общей транзакции и видят закоммиченные данные.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+COMMENTS = 20
+
+
+def reseed():
+    """
+    Базовый набор заново, с теми же id, что и в начале сессии.
+
+    Транзакционные тесты очищают таблицы после себя; при сброшенных
+    счётчиках id набор совпадает с созданным фикстурой baseline.
+    """
+    tables = connection.introspection.django_table_names(only_existing=True)
+    connection.ops.execute_sql_flush(connection.ops.sql_flush(
+        no_style(), tables, reset_sequences=True
+    ))
+    seed_baseline()
+
+
+@pytest.fixture(scope='module', autouse=True)
+def restore_baseline(baseline, django_db_blocker):
+    """После модуля базовый набор нужен остальным тестам."""
+    yield
+    with django_db_blocker.unblock():
+        reseed()
+
+
+@pytest.fixture(autouse=True)
+def fresh_baseline(transactional_db):
+    """Предыдущий тест модуля мог очистить таблицы."""
+    reseed()
+
+
+@pytest.fixture
+def queue_mode(settings):
+    """Очередь не пишет до остановки: вся пачка ждёт shutdown."""
+    settings.COMMENT_WRITE_MODE = 'queue'
+    settings.COMMENT_FLUSH_INTERVAL = 60
+    settings.COMMENT_BATCH_SIZE = COMMENTS + 1
+    yield
+    ingest.shutdown()
+
+
+def test_no_comments_lost_on_shutdown(
+    author_client, news, detail_url, queue_mode
+):
+    """Редирект сразу, а штатная остановка дописывает всю очередь."""
+    for index in range(COMMENTS):
+        response = author_client.post(
+            detail_url, data={'text': f'Комментарий {index}'}
+        )
+        assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.count() == 0
+    ingest.shutdown()
+    assert Comment.objects.filter(news=news).count() == COMMENTS
+    assert News.objects.get(pk=news.pk).comments_count == COMMENTS
+
+
+def test_full_queue_writes_synchronously(
+    author_client, news, detail_url, queue_mode, settings
+):
+    """Переполненная очередь не теряет комментарий, а пишет его сразу."""
+    settings.COMMENT_QUEUE_SIZE = 1
+    author_client.post(detail_url, data={'text': 'В очередь'})
+    author_client.post(detail_url, data={'text': 'Сразу в базу'})
+    assert list(Comment.objects.values_list('text', flat=True)) == [
+        'Сразу в базу'
+    ]
+    ingest.shutdown()
+    assert Comment.objects.count() == 2
+
+
+def test_failed_batch_retries_without_stale_ids(author, news, monkeypatch):
+    """Повтор после отката пишет комментарии с новыми, а не выданными id."""
+    batch = [
+        Comment(news=news, author=author, text='Уцелеет'),
+        Comment(news_id=news.pk + 1000, author=author, text='Потеряется'),
+    ]
+    retried = []
+    write_comments = ingest.write_comments
+
+    def spy(comments):
+        if len(comments) == 1:
+            retried.append((comments[0].pk, comments[0]._state.adding))
+        write_comments(comments)
+
+    monkeypatch.setattr(ingest, 'write_comments', spy)
+    ingest.CommentQueue(COMMENTS, COMMENTS, 0)._write(batch)
+    assert retried == [(None, True), (None, True)]
+    assert list(Comment.objects.values_list('text', flat=True)) == [
+        'Уцелеет'
+    ]
+    assert batch[0].pk == Comment.objects.get().pk
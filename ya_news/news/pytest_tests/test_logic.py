@@ -1,13 +1,22 @@
+import os
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
+from django.conf import settings
+from django.core.management import call_command
 from pytest_django.asserts import assertRedirects
 
-from news.forms import BAD_WORDS, WARNING
-from news.models import Comment
+from news.caching import feed_version, news_version
+from news.forms import WARNING
+from news.models import Comment, News
+from news.profanity import BadWordsMatcher
+from news.views import CommentDelete
 
 COMMENT_FORM_DATA = {'text': 'Тестовый текст комментария'}
-BAD_WORDS_FORM_DATA = {'text': f'Какой-то текст, {BAD_WORDS[0]}, еще текст'}
+BAD_WORDS_FORM_DATA = {
+    'text': f'Какой-то текст, {settings.BAD_WORDS[0]}, еще текст'
+}
 
 pytestmark = pytest.mark.django_db
 
@@ -29,6 +38,8 @@ def test_user_can_create_comment(
     assert comment.text == COMMENT_FORM_DATA['text']
     assert comment.news == news
     assert comment.author == author
+    news.refresh_from_db()
+    assert news.comments_count == 1
 
 
 def test_user_cant_use_bad_words(author_client, detail_url):
@@ -39,11 +50,73 @@ def test_user_cant_use_bad_words(author_client, detail_url):
     assert Comment.objects.count() == 0
 
 
-def test_author_can_delete_comment(author_client, delete_url, url_to_comments):
+def test_rejected_comment_keeps_comments(author_client, detail_url, comment):
+    """Страница с ошибкой формы показывает уже оставленные комментарии."""
+    response = author_client.post(detail_url, data=BAD_WORDS_FORM_DATA)
+    assert list(response.context['comments']) == [comment]
+    assert comment.text in response.content.decode()
+
+
+def test_bad_words_matcher_finds_every_hit():
+    """Автомат за один проход находит все, в том числе вложенные, слова."""
+    matcher = BadWordsMatcher(('редиска', 'диск', 'негодяй'))
+    assert matcher.find_all('Ты РЕДИСКА и негодяй') == [
+        (5, 'диск'), (3, 'редиска'), (13, 'негодяй'),
+    ]
+
+
+def test_bad_words_list_reloads(author_client, detail_url, settings):
+    """Изменение settings.BAD_WORDS сразу пересобирает фильтр."""
+    settings.BAD_WORDS = ('тестовый',)
+    response = author_client.post(detail_url, data=COMMENT_FORM_DATA)
+    assert WARNING in response.context['form'].errors['text']
+    assert Comment.objects.count() == 0
+
+
+def test_bad_words_file_reloads(
+        author_client, detail_url, settings, tmp_path
+):
+    """Правка файла со словами подхватывается без перезапуска."""
+    path = tmp_path / 'bad_words.txt'
+    path.write_text('\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = str(path)
+    author_client.post(detail_url, data=COMMENT_FORM_DATA)
+    assert Comment.objects.count() == 1
+    path.write_text('тестовый\n', encoding='utf-8')
+    # Время правки меняется явно: запись может попасть в тот же тик ФС.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    response = author_client.post(detail_url, data=COMMENT_FORM_DATA)
+    assert WARNING in response.context['form'].errors['text']
+    assert Comment.objects.count() == 1
+
+
+def test_author_can_delete_comment(
+        author_client,
+        news,
+        delete_url,
+        url_to_comments
+):
     """Проверка удаления комментария автором."""
     response = author_client.post(delete_url)
     assertRedirects(response, url_to_comments)
     assert Comment.objects.count() == 0
+    news.refresh_from_db()
+    assert news.comments_count == 0
+
+
+def test_repeated_delete_keeps_count(
+        author_client, news, comment, delete_url, url_to_comments, monkeypatch
+):
+    """Комментарий, уже удалённый другим запросом, не уменьшает счётчик."""
+    Comment.objects.filter(pk=comment.pk).delete()
+    monkeypatch.setattr(
+        CommentDelete, 'get_object', lambda self, queryset=None: comment
+    )
+    response = author_client.post(delete_url)
+    assertRedirects(response, url_to_comments)
+    news.refresh_from_db()
+    assert news.comments_count == 1
 
 
 def test_user_cant_delete_comment_of_another_user(
@@ -88,3 +161,26 @@ def test_user_cant_edit_comment_of_another_user(
     assert comment_from_db.text == comment.text
     assert comment_from_db.news == comment.news
     assert comment_from_db.author == comment.author
+
+
+def test_recount_comments_command(news, multiple_comments):
+    """Команда пересчёта восстанавливает счётчик комментариев."""
+    News.objects.update(comments_count=0)
+    call_command('recount_comments', stdout=StringIO())
+    news.refresh_from_db()
+    assert news.comments_count == Comment.objects.filter(news=news).count()
+    assert not News.objects.exclude(pk=news.pk).exclude(
+        comments_count=0
+    ).exists()
+
+
+def test_recount_bumps_changed_news(news, multiple_comments):
+    """После пересчёта страница новости и лента не отдаются из кэша."""
+    other = News.objects.exclude(pk=news.pk).first()
+    News.objects.filter(pk=news.pk).update(comments_count=0)
+    before = (feed_version(), news_version(news.pk), news_version(other.pk))
+    assert News.objects.recount_comments() == 1
+    after = (feed_version(), news_version(news.pk), news_version(other.pk))
+    assert after[0] != before[0]
+    assert after[1] != before[1]
+    assert after[2] == before[2]
@@ -0,0 +1,115 @@
+import pytest
+from django.test import override_settings
+from pytest_lazyfixture import lazy_fixture as lf
+
+from news.checks import shared_cache
+from news.pytest_tests.conftest import TEST_CACHES
+from news.pytest_tests.query_budget import QUERY_BUDGETS, QueryBudgetClient
+from ya_common import profiling
+from ya_common.caching import FileBasedCache
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    'url, view_name',
+    [
+        (lf('home_url'), 'news:home'),
+        (lf('detail_url'), 'news:detail'),
+        (lf('comments_url'), 'news:comments'),
+        (lf('edit_url'), 'news:edit'),
+        (lf('delete_url'), 'news:delete'),
+    ]
+)
+def test_query_budget(author_client, url, view_name, multiple_comments):
+    """Число запросов не растёт вместе с числом комментариев."""
+    response = author_client.get(url)
+    assert response.resolver_match.view_name == view_name
+    assert len(response.captured_queries) <= QUERY_BUDGETS[view_name]['GET']
+
+
+@pytest.mark.parametrize(
+    'url, view_name, data',
+    [
+        (lf('detail_url'), 'news:detail', {'text': 'Новый комментарий'}),
+        (lf('edit_url'), 'news:edit', {'text': 'Исправленный текст'}),
+        (lf('delete_url'), 'news:delete', {}),
+    ]
+)
+def test_post_query_budget(author_client, url, view_name, data, comment):
+    """Запись комментария не перечитывает уже загруженные объекты."""
+    response = author_client.post(url, data=data)
+    assert response.resolver_match.view_name == view_name
+    assert len(response.captured_queries) == (
+        QUERY_BUDGETS[view_name]['POST']
+    )
+
+
+def test_query_budget_reports_duplicates(author_client, detail_url, news):
+    """Превышение бюджета показывает повторяющийся SQL."""
+    author_client.budgets = {'news:detail': {'GET': 1}}
+    with pytest.raises(AssertionError, match='бюджете 1'):
+        author_client.get(detail_url)
+
+
+def test_profiling_disabled(client, detail_url):
+    """Без настройки PROFILING заголовка Server-Timing нет."""
+    assert 'Server-Timing' not in client.get(detail_url).headers
+
+
+def test_profiling(detail_url, comment, tmp_path):
+    """Server-Timing, гистограмма по имени URL и дамп cProfile."""
+    profiling.reset()
+    with override_settings(
+        PROFILING=True, PROFILING_SAMPLE_RATE=1, PROFILING_DIR=tmp_path
+    ):
+        response = QueryBudgetClient().get(detail_url)
+    timing = response.headers['Server-Timing']
+    queries = len(response.captured_queries)
+    assert f'desc="{queries} queries"' in timing
+    assert 'template;dur=' in timing
+    stats = profiling.snapshot()['news:detail']
+    assert stats['count'] == 1
+    assert stats['template']['p50'] > 0
+    assert list(tmp_path.glob('news-detail-*.prof'))
+
+
+def test_profiling_unresolved_paths(client):
+    """Запросы мимо маршрутов копятся под одним ключом, а не по путям."""
+    profiling.reset()
+    with override_settings(PROFILING=True):
+        for number in range(3):
+            client.get(f'/missing/{number}/')
+    assert profiling.snapshot().keys() == {profiling.UNRESOLVED}
+    assert profiling.snapshot()[profiling.UNRESOLVED]['count'] == 3
+
+
+def test_shared_cache_check(settings):
+    """Проверка проекта не пропускает кэш в памяти процесса."""
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': '/tmp/yanews-cache',
+    }}
+    assert shared_cache(None) == []
+    settings.CACHES = TEST_CACHES
+    assert [error.id for error in shared_cache(None)] == ['news.E001']
+
+
+def test_file_cache_culls_by_interval(tmp_path, monkeypatch):
+    """Файловый кэш перечисляет каталог раз в CULL_INTERVAL, а не на set."""
+    cache = FileBasedCache(tmp_path, {'OPTIONS': {
+        'MAX_ENTRIES': 2, 'CULL_FREQUENCY': 2, 'CULL_INTERVAL': 60,
+    }})
+    listings = []
+    list_cache_files = cache._list_cache_files
+    monkeypatch.setattr(
+        cache, '_list_cache_files',
+        lambda: listings.append(1) or list_cache_files(),
+    )
+    for index in range(5):
+        cache.set(f'key-{index}', index)
+    assert len(listings) == 1
+    cache._next_cull = 0
+    cache.set('key-5', 5)
+    assert len(listings) == 2
+    assert len(list_cache_files()) < 6
@@ -0,0 +1,68 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from news.models import News
+from news.routers import PRIMARY_COOKIE, REPLICA
+
+pytestmark = pytest.mark.django_db(databases=[DEFAULT_DB_ALIAS, REPLICA])
+
+COMMENT_TEXT = 'Комментарий только в основной базе'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def replica_file(baseline, tmp_path_factory, django_db_blocker):
+    """
+    Реплика — отдельный файл SQLite со снимком основной базы.
+
+    Снимок делается один раз до тестов, поэтому всё записанное в тесте
+    есть только в основной базе, как при отставании репликации.
+    """
+    replica = connections[REPLICA]
+    primary_name = replica.settings_dict['NAME']
+    path = tmp_path_factory.mktemp('replica') / 'replica.sqlite3'
+    with django_db_blocker.unblock():
+        connections[DEFAULT_DB_ALIAS].ensure_connection()
+        target = sqlite3.connect(path)
+        connections[DEFAULT_DB_ALIAS].connection.backup(target)
+        target.close()
+    replica.close()
+    replica.settings_dict['NAME'] = str(path)
+    yield
+    replica.close()
+    replica.settings_dict['NAME'] = primary_name
+
+
+def test_reads_go_to_replica(client, home_url):
+    """Лента читается из реплики и не видит новость из основной базы."""
+    News.objects.create(title='Свежая новость', text='Текст')
+    assert 'Свежая новость' not in client.get(home_url).content.decode()
+
+
+def test_author_reads_own_comment(
+    author_client, reader_client, detail_url, url_to_comments
+):
+    """После записи автор читает из основной базы, остальные — из реплики."""
+    response = author_client.post(detail_url, data={'text': COMMENT_TEXT})
+    assert response.url == url_to_comments
+    assert PRIMARY_COOKIE in response.cookies
+    response = author_client.get(detail_url)
+    assert response.status_code == HTTPStatus.OK
+    assert COMMENT_TEXT in response.content.decode()
+    assert COMMENT_TEXT not in reader_client.get(detail_url).content.decode()
+
+
+def test_window_expires(author_client, detail_url):
+    """Когда окно закрылось, автор снова читает из реплики."""
+    author_client.post(detail_url, data={'text': COMMENT_TEXT})
+    author_client.cookies[PRIMARY_COOKIE] = '0'
+    assert COMMENT_TEXT not in author_client.get(detail_url).content.decode()
+
+
+def test_writes_go_to_primary(author_client, edit_url, comment):
+    """Правка комментария пишет и читает основную базу."""
+    author_client.post(edit_url, data={'text': COMMENT_TEXT})
+    comment.refresh_from_db()
+    assert comment.text == COMMENT_TEXT
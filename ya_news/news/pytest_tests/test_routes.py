@@ -1,6 +1,7 @@
 from http import HTTPStatus
 
 import pytest
+from django.contrib.sessions.models import Session
 from pytest_django.asserts import assertRedirects
 from pytest_lazyfixture import lazy_fixture as lf
 
@@ -17,6 +18,8 @@ READER_CLIENT = lf('reader_client')
 # Константы URL
 HOME_URL = lf('home_url')
 DETAIL_URL = lf('detail_url')
+SEARCH_URL = lf('search_url')
+COMMENTS_URL = lf('comments_url')
 LOGIN_URL = lf('login_url')
 SIGNUP_URL = lf('signup_url')
 LOGOUT_URL = lf('logout_url')
@@ -34,6 +37,8 @@ pytestmark = pytest.mark.django_db
         # Публичные GET-страницы
         (HOME_URL, ANONYMOUS_CLIENT, 'get', OK),
         (DETAIL_URL, ANONYMOUS_CLIENT, 'get', OK),
+        (COMMENTS_URL, ANONYMOUS_CLIENT, 'get', OK),
+        (SEARCH_URL, ANONYMOUS_CLIENT, 'get', OK),
         (LOGIN_URL, ANONYMOUS_CLIENT, 'get', OK),
         (SIGNUP_URL, ANONYMOUS_CLIENT, 'get', OK),
 
@@ -70,3 +75,40 @@ def test_anonymous_redirects(client, url, redirect_url):
     """Проверка редиректов для неавторизованных пользователей."""
     response = client.get(url)
     assertRedirects(response, redirect_url)
+
+
+def test_login_without_session_rows(author_client, author, home_url):
+    """Клиент авторизован, но таблица сессий не тронута."""
+    response = author_client.get(home_url)
+    assert response.context['user'] == author
+    assert not Session.objects.exists()
+
+
+@pytest.mark.parametrize('url', (HOME_URL, DETAIL_URL))
+def test_not_modified(client, url):
+    """Повторный запрос с тем же ETag получает 304 без тела."""
+    etag = client.get(url)['ETag']
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not response.content
+
+
+def test_etag_changes_with_comments(author_client, detail_url, edit_url):
+    """Новый и отредактированный комментарий меняют ETag новости."""
+    etag = author_client.get(detail_url)['ETag']
+    author_client.post(detail_url, data={'text': 'Новый комментарий'})
+    response = author_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == OK
+    etag = response['ETag']
+    author_client.post(edit_url, data={'text': 'Исправленный текст'})
+    response = author_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == OK
+
+
+def test_etag_per_user(client, author_client, reader_client, home_url):
+    """Страница с именем пользователя не отдаётся из чужого кэша."""
+    etags = {
+        test_client.get(home_url)['ETag']
+        for test_client in (client, author_client, reader_client)
+    }
+    assert len(etags) == 3
@@ -0,0 +1,79 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+# Кука с моментом, до которого пользователь читает из основной базы.
+PRIMARY_COOKIE = 'read_primary_until'
+
+_read_alias = ContextVar('news_read_alias', default=None)
+
+
+def replica_alias():
+    """
+    Псевдоним реплики или None, если читать из неё нечего.
+
+    Реплика, которая смотрит в тот же файл, что и основная база (локальный
+    запуск, тестовое зеркало), не используется: это лишнее соединение.
+    """
+    if REPLICA not in connections.settings:
+        return None
+    name = connections[REPLICA].settings_dict['NAME']
+    if name == connections[DEFAULT_DB_ALIAS].settings_dict['NAME']:
+        return None
+    return REPLICA
+
+
+def wrote_recently(request):
+    try:
+        return float(request.COOKIES[PRIMARY_COOKIE]) > time.time()
+    except (KeyError, ValueError):
+        return False
+
+
+@contextmanager
+def reads_from_replica(request):
+    """
+    Чтения новостей внутри блока идут в реплику.
+
+    Исключение — пользователь, который недавно писал: до конца окна
+    READ_YOUR_WRITES_SECONDS он читает из основной базы и видит свой
+    комментарий сразу после редиректа.
+    """
+    alias = None if wrote_recently(request) else replica_alias()
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def mark_write(response):
+    """Открывает пользователю окно чтения из основной базы."""
+    window = settings.READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        PRIMARY_COOKIE, f'{time.time() + window:.0f}',
+        max_age=window, httponly=True, samesite='Lax',
+    )
+    return response
+
+
+class ReplicaRouter:
+    """
+    Чтения моделей news внутри reads_from_replica — из реплики.
+
+    Всё остальное, в том числе пользователи, сессии и любые записи,
+    остаётся на основной базе: роутер в этих случаях не высказывается.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'news':
+            return _read_alias.get()
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Схема реплики приходит вместе с данными из основной базы.
+        return db != REPLICA
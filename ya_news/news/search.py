@@ -0,0 +1,122 @@
+import math
+
+from django.core.exceptions import BadRequest
+from django.db import connection
+
+from ya_common.search import prefix_terms
+
+from .pagination import (
+    NEXT, PREVIOUS, KeysetPage, decode_cursor, encode_cursor,
+)
+
+# Виртуальная таблица FTS5 из миграции 0005_news_search_index.
+FTS_TABLE = 'news_news_fts'
+# rowid в SQLite — знаковое 64-битное целое.
+MAX_ROWID = 2 ** 63 - 1
+
+
+def build_match(text):
+    """
+    Выражение MATCH для строки поиска.
+
+    Каждое слово ищется по префиксу своей основы, слова объединяются
+    через AND.
+    """
+    return prefix_terms(text)
+
+
+class SearchPaginator:
+    """
+    Ранжированный поиск с курсором по (rank, id).
+
+    rank — bm25 из FTS5, чем меньше, тем релевантнее. Страница — один
+    запрос к индексу с LIMIT per_page + 1 и один запрос за новостями.
+    """
+
+    def __init__(self, queryset, per_page, match):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.match = match
+
+    def get_page(self, cursor=None):
+        if not self.match:
+            return KeysetPage([], None, None)
+        direction, values = NEXT, None
+        if cursor:
+            direction, values = decode_cursor(cursor)
+            values = self._clean(values)
+        backwards = direction == PREVIOUS
+        rows = self._ranked_ids(values, backwards)
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        news = self.queryset.in_bulk([pk for pk, _ in rows])
+        object_list = []
+        for pk, rank in rows:
+            if pk in news:
+                news[pk].search_rank = rank
+                object_list.append(news[pk])
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(NEXT, rows[-1][::-1])
+        if rows and has_previous:
+            previous_cursor = encode_cursor(PREVIOUS, rows[0][::-1])
+        return KeysetPage(object_list, next_cursor, previous_cursor)
+
+    def _clean(self, values):
+        """
+        Пара (rank, id) из курсора.
+
+        Значения уходят в SQL без ORM, поэтому подделанные — не число,
+        NaN, бесконечность или id за пределами rowid — дают 400, а не
+        ошибку драйвера.
+        """
+        if len(values) != 2:
+            raise BadRequest('Некорректный курсор.')
+        rank, pk = values
+        if (
+            isinstance(rank, bool) or not isinstance(rank, (int, float))
+            or isinstance(pk, bool) or not isinstance(pk, int)
+            or not 0 <= pk <= MAX_ROWID
+        ):
+            raise BadRequest('Некорректный курсор.')
+        try:
+            rank = float(rank)
+        except OverflowError:
+            raise BadRequest('Некорректный курсор.')
+        if not math.isfinite(rank):
+            raise BadRequest('Некорректный курсор.')
+        return [rank, pk]
+
+    def _ranked_ids(self, values, backwards):
+        """Пары (id, rank) следующей страницы прямо из индекса."""
+        order = 'DESC' if backwards else 'ASC'
+        sql = (
+            f'SELECT rowid, rank FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s'
+        )
+        params = [self.match]
+        if values is not None:
+            sign = '<' if backwards else '>'
+            sql += f' AND (rank, rowid) {sign} (%s, %s)'
+            params += values
+        sql += f' ORDER BY rank {order}, rowid {order} LIMIT %s'
+        params.append(self.per_page + 1)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [list(row) for row in cursor.fetchall()]
+
+
+def rebuild_index():
+    """Перестраивает индекс целиком по таблице новостей."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"
+        )
@@ -0,0 +1,67 @@
+"""
+Синтетические данные для замеров на больших объёмах.
+
+Распределения приближены к настоящим: длина текстов логнормальная,
+комментарии распределены по новостям по закону Ципфа, так что у немногих
+новостей длинные ветки, а у большинства — несколько комментариев или ни
+одного.
+"""
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from ya_common.seeding import lognormal, sentence, zipf_weights
+
+from .models import Comment, News
+
+
+def batched(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def seed_news(rng, users, news_count, comments_count, batch_size, report):
+    """
+    Новости и комментарии пачками по batch_size.
+
+    Длина веток разыгрывается заранее, поэтому comments_count у новостей
+    сразу верный и пересчёт не нужен.
+    """
+    weights = zipf_weights(news_count)
+    threads = [0] * news_count
+    for index in rng.choices(
+        range(news_count), cum_weights=weights, k=comments_count
+    ):
+        threads[index] += 1
+    rng.shuffle(threads)
+    today = date.today()
+    news = []
+    with transaction.atomic():
+        for batch in batched(threads, batch_size):
+            news.extend(News.objects.bulk_create(
+                News(
+                    title=sentence(rng, rng.randint(2, 5))[:50],
+                    text=sentence(rng, lognormal(rng, 120, 0.6, 10, 2000)),
+                    date=today - timedelta(days=rng.randint(0, 3650)),
+                    comments_count=size,
+                )
+                for size in batch
+            ))
+            report(f'Новостей: {len(news)}')
+    pairs = [
+        (item.pk, author)
+        for item, size in zip(news, threads)
+        for author in rng.choices(users, k=size)
+    ]
+    created = 0
+    with transaction.atomic():
+        for batch in batched(pairs, batch_size):
+            created += len(Comment.objects.bulk_create(
+                Comment(
+                    news_id=news_id, author=author,
+                    text=sentence(rng, lognormal(rng, 20, 0.9, 1, 500)),
+                )
+                for news_id, author in batch
+            ))
+            report(f'Комментариев: {created}')
+    return len(news), created
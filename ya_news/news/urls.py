@@ -1,16 +1,38 @@
+from django.conf import settings
 from django.urls import path
 
 from news import views
 
 app_name = 'news'
 
-urlpatterns = [
-    path('', views.NewsList.as_view(), name='home'),
-    path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
-    path(
-        'delete_comment/<int:pk>/',
-        views.CommentDelete.as_view(),
-        name='delete'
-    ),
-    path('edit_comment/<int:pk>/', views.CommentUpdate.as_view(), name='edit'),
-]
+
+def news_patterns(async_views):
+    """Маршруты приложения; лента и новость — синхронные или для ASGI."""
+    if async_views:
+        news_list, news_detail = views.AsyncNewsList, views.AsyncNewsDetailView
+    else:
+        news_list, news_detail = views.NewsList, views.NewsDetailView
+    return [
+        path('', news_list.as_view(), name='home'),
+        path('search/', views.NewsSearch.as_view(), name='search'),
+        path('export/', views.NewsExport.as_view(), name='export'),
+        path('news/<int:pk>/', news_detail.as_view(), name='detail'),
+        path(
+            'news/<int:pk>/comments/',
+            views.NewsComments.as_view(),
+            name='comments'
+        ),
+        path(
+            'delete_comment/<int:pk>/',
+            views.CommentDelete.as_view(),
+            name='delete'
+        ),
+        path(
+            'edit_comment/<int:pk>/',
+            views.CommentUpdate.as_view(),
+            name='edit'
+        ),
+    ]
+
+
+urlpatterns = news_patterns(settings.NEWS_ASYNC_VIEWS)
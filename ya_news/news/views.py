@@ -1,39 +1,143 @@
+import re
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+
 from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.exceptions import BadRequest
+from django.db import transaction
+from django.http import (
+    Http404, HttpResponseRedirect, StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
+from .caching import COMMENT_VERSION_KEY, NEWS_VERSION_KEY, attach_versions
+from .conditional import apage_state, news_etag, news_last_modified
+from .export import FORMATS, export_chunks, gzip_chunks
 from .forms import CommentForm
+from .ingest import enqueue
 from .models import Comment, News
+from .pagination import KeysetPaginationMixin, KeysetPaginator
+from .routers import mark_write, reads_from_replica
+from .search import SearchPaginator, build_match
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+conditional_get = method_decorator(
+    condition(etag_func=news_etag, last_modified_func=news_last_modified),
+    name='get',
+)
+
+
+def async_conditional_get(view_class):
+    """
+    conditional_get для асинхронного get.
+
+    method_decorator в Django 5.1 не помечает обёртку как корутину,
+    и без пометки View считает представление синхронным.
+    """
+    view_class = conditional_get(view_class)
+    markcoroutinefunction(view_class.get)
+    return view_class
+
+
+class FragmentCacheMixin:
+    """
+    Данные для тега {% cache %} в шаблонах новостей и комментариев.
+
+    Ключ фрагмента — id объекта и его версия, которая меняется при
+    сохранении или удалении. В кэш попадает только общая для всех
+    пользователей разметка, ссылки автора рисуются вне фрагмента.
+    """
+
+    def get_fragment_objects(self, context):
+        """Пары (объекты, шаблон ключа версии) для attach_versions."""
+        return ()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        attach_versions(*self.get_fragment_objects(context))
+        context['fragment_timeout'] = settings.FRAGMENT_CACHE_TIMEOUT
+        return context
+
+
+class ReplicaReadMixin:
+    """
+    Страница читает новости из реплики.
+
+    Вся выборка происходит в dispatch, включая даты для ETag, поэтому
+    отрисовке шаблона после выхода из блока база уже не нужна.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with reads_from_replica(request):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ReadYourWritesMixin:
+    """После успешной записи автор какое-то время читает из основной базы."""
+
+    def form_valid(self, form):
+        return mark_write(super().form_valid(form))
 
 
-class NewsList(generic.ListView):
-    """Список новостей."""
+@conditional_get
+class NewsList(
+        ReplicaReadMixin,
+        KeysetPaginationMixin,
+        FragmentCacheMixin,
+        generic.ListView,
+):
+    """
+    Список новостей.
+
+    Лента листается курсором по (date, id), размер страницы определяется
+    в настройках проекта. Число комментариев берётся из денормализованного
+    счётчика, сами комментарии не грузим.
+    """
     model = News
     template_name = 'news/home.html'
+    paginate_by = settings.NEWS_COUNT_ON_HOME_PAGE
 
-    def get_queryset(self):
-        """
-        Выводим только несколько последних новостей.
+    def get_fragment_objects(self, context):
+        return ((context['object_list'], NEWS_VERSION_KEY),)
 
-        Их количество определяется в настройках проекта.
-        """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+
+class NewsPageMixin(FragmentCacheMixin):
+    """
+    Контекст страницы новости: сама новость и первая страница комментариев.
+
+    Общий для показа страницы и для её повторной отрисовки с ошибками
+    формы после отклонённого комментария.
+    """
+
+    def get_context_data(self, **kwargs):
+        """В ответ попадает только первая страница комментариев."""
+        kwargs['comments'] = KeysetPaginator(
+            self.object.comment_set.select_related('author'),
+            settings.COMMENTS_COUNT_ON_PAGE
+        ).get_page()
+        return super().get_context_data(**kwargs)
+
+    def get_fragment_objects(self, context):
+        return (
+            ((self.object,), NEWS_VERSION_KEY),
+            (context['comments'], COMMENT_VERSION_KEY),
+        )
 
 
-class NewsDetail(generic.DetailView):
+@conditional_get
+class NewsDetail(ReplicaReadMixin, NewsPageMixin, generic.DetailView):
     model = News
     template_name = 'news/detail.html'
 
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
-        return obj
+        return get_object_or_404(self.model, pk=self.kwargs['pk'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -42,8 +146,123 @@ class NewsDetail(generic.DetailView):
         return context
 
 
+class NewsComments(
+        KeysetPaginationMixin, FragmentCacheMixin, generic.ListView
+):
+    """Фрагмент со следующей страницей комментариев к новости."""
+    template_name = 'news/comments.html'
+    paginate_by = settings.COMMENTS_COUNT_ON_PAGE
+
+    def get_fragment_objects(self, context):
+        return ((context['object_list'], COMMENT_VERSION_KEY),)
+
+    def get_queryset(self):
+        return Comment.objects.filter(
+            news_id=self.kwargs['pk']
+        ).select_related('author')
+
+
+class AsyncNewsMixin(
+        FragmentCacheMixin,
+        generic.base.TemplateResponseMixin,
+        generic.base.ContextMixin,
+        generic.View,
+):
+    """
+    Общая часть асинхронных страниц ленты и новости.
+
+    Пользователь и состояние для ETag загружаются до condition через
+    асинхронный API, поэтому синхронные news_etag и news_last_modified
+    в цикле событий берут готовые значения. Шаблон отрисовывается
+    обработчиком Django в потоке, как и у синхронных представлений.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        with reads_from_replica(request):
+            await apage_state(request, kwargs.get('pk'))
+            return await super().dispatch(request, *args, **kwargs)
+
+
+@async_conditional_get
+class AsyncNewsList(AsyncNewsMixin):
+    """Лента новостей для ASGI, тот же вывод, что у NewsList."""
+    template_name = NewsList.template_name
+
+    async def get(self, request, *args, **kwargs):
+        page = await KeysetPaginator(
+            News.objects.all(), NewsList.paginate_by
+        ).aget_page(request.GET.get(KeysetPaginationMixin.cursor_kwarg))
+        return self.render_to_response(self.get_context_data(
+            object_list=page.object_list,
+            news_list=page.object_list,
+            page_obj=page,
+            is_paginated=page.has_other_pages(),
+        ))
+
+    def get_fragment_objects(self, context):
+        return ((context['object_list'], NEWS_VERSION_KEY),)
+
+
+@async_conditional_get
+class AsyncNewsDetail(AsyncNewsMixin):
+    """
+    Страница новости для ASGI.
+
+    Новость и первая страница комментариев — два независимых запроса, но
+    асинхронный ORM Django выполняет их по очереди в одном потоке, так
+    что выигрыш только в том, что цикл событий не ждёт базу.
+    """
+    template_name = NewsDetail.template_name
+
+    async def get(self, request, *args, **kwargs):
+        pk = kwargs['pk']
+        try:
+            news = await News.objects.aget(pk=pk)
+        except News.DoesNotExist:
+            raise Http404('Новость не найдена.')
+        comments = await KeysetPaginator(
+            Comment.objects.filter(news_id=pk).select_related('author'),
+            settings.COMMENTS_COUNT_ON_PAGE,
+        ).aget_page()
+        context = {'object': news, 'news': news, 'comments': comments}
+        if request.user.is_authenticated:
+            context['form'] = CommentForm()
+        return self.render_to_response(self.get_context_data(**context))
+
+    def get_fragment_objects(self, context):
+        return (
+            ((context['news'],), NEWS_VERSION_KEY),
+            (context['comments'], COMMENT_VERSION_KEY),
+        )
+
+
+class NewsSearch(KeysetPaginationMixin, generic.ListView):
+    """
+    Поиск по заголовкам и текстам новостей.
+
+    Результаты идут по релевантности из индекса FTS5, страницы листаются
+    курсором по (rank, id).
+    """
+    model = News
+    template_name = 'news/search.html'
+    paginate_by = settings.NEWS_COUNT_ON_HOME_PAGE
+
+    def get_keyset_paginator(self, queryset, page_size):
+        return SearchPaginator(
+            queryset, page_size, build_match(self.request.GET.get('q', ''))
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        return context
+
+
 class NewsComment(
         LoginRequiredMixin,
+        ReadYourWritesMixin,
+        NewsPageMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -59,12 +278,18 @@ class NewsComment(
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
-        comment.save()
+        if not enqueue(comment):
+            with transaction.atomic():
+                comment.save()
+                self.model.objects.filter(
+                    pk=self.object.pk
+                ).change_comments_count(1)
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
@@ -78,19 +303,37 @@ class NewsDetailView(generic.View):
         return view(request, *args, **kwargs)
 
 
-class CommentBase(LoginRequiredMixin):
+class AsyncNewsDetailView(generic.View):
+    """Как NewsDetailView, но страница новости отдаётся асинхронно."""
+
+    async def get(self, request, *args, **kwargs):
+        return await AsyncNewsDetail.as_view()(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        view = sync_to_async(NewsComment.as_view())
+        return await view(request, *args, **kwargs)
+
+
+class CommentBase(LoginRequiredMixin, ReadYourWritesMixin):
     """Базовый класс для работы с комментариями."""
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        # Комментарий уже загружен представлением, а при удалении к
+        # этому моменту может быть удалён, поэтому берём news_id.
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
-        """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        """
+        Пользователь может работать только со своими комментариями.
+
+        Заголовок новости нужен шаблонам формы, берём его тем же запросом.
+        """
+        return self.model.objects.filter(
+            author=self.request.user
+        ).select_related('news')
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
@@ -102,3 +345,47 @@ class CommentUpdate(CommentBase, generic.UpdateView):
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+    def form_valid(self, form):
+        """
+        Счётчик новости сдвигается, только если строка и правда удалена.
+
+        Параллельный запрос мог удалить комментарий после get_object.
+        """
+        with transaction.atomic():
+            deleted, _ = self.object.delete()
+            if deleted:
+                News.objects.filter(
+                    pk=self.object.news_id
+                ).change_comments_count(-1)
+        return mark_write(HttpResponseRedirect(self.get_success_url()))
+
+
+class NewsExport(UserPassesTestMixin, generic.View):
+    """
+    Выгрузка всех новостей с комментариями для редакторов.
+
+    Ответ собирается генератором по пачкам новостей и при поддержке
+    клиентом сжимается в gzip на лету.
+    """
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        file_format = request.GET.get('format', 'jsonl')
+        if file_format not in FORMATS:
+            raise BadRequest('Неизвестный формат выгрузки.')
+        chunks = export_chunks(file_format)
+        response = StreamingHttpResponse(
+            content_type=f'{FORMATS[file_format]}; charset=utf-8'
+        )
+        if ACCEPTS_GZIP.search(request.headers.get('Accept-Encoding', '')):
+            chunks = gzip_chunks(chunks)
+            response['Content-Encoding'] = 'gzip'
+        response.streaming_content = chunks
+        response['Content-Disposition'] = (
+            f'attachment; filename="news.{file_format}"'
+        )
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
@@ -0,0 +1,4 @@
+"""Маршруты с асинхронными лентой и страницей новости для тестов и замеров."""
+from .urls import project_patterns
+
+urlpatterns = project_patterns(async_views=True)
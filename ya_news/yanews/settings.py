@@ -21,6 +21,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ya_common.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,6 +56,55 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами потока, прагмы не повторяются.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Запись берёт блокировку в начале транзакции: при DEFERRED
+            # повышение блокировки на конфликте сразу падает с
+            # "database is locked", не дожидаясь timeout.
+            'transaction_mode': 'IMMEDIATE',
+            # Сколько секунд ждать чужую блокировку вместо ошибки.
+            'timeout': 5,
+            # Прагмы нового соединения: в режиме WAL читатели не ждут
+            # писателя, а fsync при synchronous=NORMAL идёт на контрольной
+            # точке, а не на каждый коммит. cache_size < 0 — размер
+            # страничного кэша в КиБ.
+            'init_command': (
+                'PRAGMA journal_mode = WAL;'
+                'PRAGMA synchronous = NORMAL;'
+                'PRAGMA cache_size = -64000;'
+                'PRAGMA mmap_size = 268435456'
+            ),
+        },
+    }
+}
+# Реплика для чтения ленты и страниц новостей. На сервере NAME указывает
+# на копию, которую обновляет репликация; пока это тот же файл, что и у
+# default, ReplicaRouter её не использует.
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'TEST': {'MIRROR': 'default'},
+}
+DATABASE_ROUTERS = ['news.routers.ReplicaRouter']
+# Сколько секунд после записи пользователь читает из основной базы.
+READ_YOUR_WRITES_SECONDS = 10
+
+# Версии страниц для ETag и кэша фрагментов общие для всех процессов
+# сервера, см. news/checks.py. Файловый кэш виден всем процессам машины,
+# как и файл SQLite; на нескольких машинах нужен Memcached или Redis.
+# На каждую открытую новость приходится три ключа (версия, карточка,
+# текст) и по два на комментарий первой страницы: MAX_ENTRIES с запасом
+# вмещает горячие страницы базы из команды seed.
+CACHES = {
+    'default': {
+        'BACKEND': 'ya_common.caching.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 50_000,
+            'CULL_FREQUENCY': 4,
+            'CULL_INTERVAL': 60,
+        },
     }
 }
 
@@ -81,8 +131,38 @@ LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
 
+COMMENTS_COUNT_ON_PAGE = 50
+
+# Запись комментариев: 'sync' — до ответа, своей транзакцией; 'queue' —
+# фоновым потоком пачками, см. news/ingest.py. В режиме 'queue' комментарии,
+# не записанные к аварийному завершению процесса, теряются, а сразу после
+# редиректа автор может ещё не увидеть свой комментарий.
+COMMENT_WRITE_MODE = 'sync'
+# Переполненная очередь не теряет комментарии, а пишет их сразу.
+COMMENT_QUEUE_SIZE = 10_000
+COMMENT_BATCH_SIZE = 500
+COMMENT_FLUSH_INTERVAL = 0.05
+
+# Асинхронные ленту и страницу новости стоит включать при запуске под ASGI,
+# под WSGI каждый их запрос проходит через async_to_sync.
+NEWS_ASYNC_VIEWS = False
+
+# Срок жизни фрагментов {% cache %}; устаревшие вытесняет смена версии.
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
 BAD_WORDS = (
     'редиска',
     'негодяй',
     # Дополните список на своё усмотрение.
 )
+# Дополнительный список, по слову в строке. Его правки подхватываются
+# без перезапуска сервера, см. news/profanity.py.
+BAD_WORDS_FILE = None
+
+# Замеры запросов в Server-Timing и гистограммы по URL,
+# см. ya_common/profiling.py.
+PROFILING = False
+PROFILING_HISTOGRAM_SIZE = 1000
+# Доля запросов, которые снимаются cProfile в PROFILING_DIR.
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_DIR = None
@@ -1,13 +1,11 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path
 from django.views.generic import CreateView
 
-urlpatterns = [
-    path('', include('news.urls')),
-    path('admin/', admin.site.urls),
-]
+from news.urls import news_patterns
 
 auth_urls = ([
     path(
@@ -33,4 +31,14 @@ auth_urls = ([
     ),
 ], 'users')
 
-urlpatterns += [path('auth/', include(auth_urls))]
+
+def project_patterns(async_views):
+    """Маршруты проекта; async_views включает ленту и новость для ASGI."""
+    return [
+        path('', include((news_patterns(async_views), 'news'))),
+        path('admin/', admin.site.urls),
+        path('auth/', include(auth_urls)),
+    ]
+
+
+urlpatterns = project_patterns(settings.NEWS_ASYNC_VIEWS)
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# Пакет ya_common с кодом, общим для YaNews и YaNote, лежит в корне
+# репозитория, а проект запускается из своего каталога.
+REPO_DIR = str(Path(__file__).resolve().parents[2])
+if REPO_DIR not in sys.path:
+    sys.path.append(REPO_DIR)
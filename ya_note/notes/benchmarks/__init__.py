@@ -0,0 +1,5 @@
+"""
+Регрессионные замеры ya_note.
+
+Запуск из каталога ya_note: pytest notes/benchmarks.
+"""
@@ -0,0 +1,49 @@
+"""
+Регрессионные замеры горячих страниц YaNote.
+
+Запуск из каталога ya_note: pytest notes/benchmarks. Сверка с baselines.json
+и параметры командной строки — в ya_common.benchmarks.
+"""
+import random
+
+import pytest
+from django.test import override_settings
+
+from notes.models import Note
+from notes.seeding import seed_notes
+from notes.slugs import allocate_slug
+from notes.tests.test_mixins import TEST_CACHES
+from ya_common.benchmarks import (  # noqa: F401
+    benchmark, pytest_addoption, pytest_configure, pytest_terminal_summary,
+)
+from ya_common.seeding import seed_users
+
+SLUG_COLLISIONS = 1000
+
+
+@pytest.fixture(scope='session', autouse=True)
+def process_cache():
+    """Замеры сбрасывают кэш, поэтому он свой, а не общий файловый."""
+    with override_settings(CACHES=TEST_CACHES):
+        yield
+
+
+@pytest.fixture(scope='session')
+def seeded(process_cache, django_db_setup, django_db_blocker):
+    """
+    Автор с 10k заметок и 1000 занятых slug для заголовка «Заметка».
+
+    Строятся один раз на прогон теми же функциями, что и команда seed.
+    """
+    with django_db_blocker.unblock():
+        author, = seed_users(1)
+        seed_notes(random.Random(0), [author], 10_000, 1000, lambda _: None)
+        base = allocate_slug(Note.objects.all(), 'Заметка')
+        Note.objects.bulk_create(
+            Note(
+                title='Заметка', text='Текст', author=author,
+                slug=base if number == 1 else f'{base}-{number}',
+            )
+            for number in range(1, SLUG_COLLISIONS + 1)
+        )
+        return author
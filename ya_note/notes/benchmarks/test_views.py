@@ -0,0 +1,39 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def author_client(seeded):
+    client = Client()
+    client.force_login(seeded)
+    return client
+
+
+def test_notes_list(benchmark, author_client):
+    url = reverse('notes:list')
+
+    def get():
+        # Холодный запрос: строки списка в кэше сброшены.
+        cache.clear()
+        response = author_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+    benchmark(get)
+
+
+def test_note_create_slug_collision(benchmark, author_client):
+    url = reverse('notes:add')
+
+    def post():
+        response = author_client.post(
+            url, data={'title': 'Заметка', 'text': 'Текст', 'slug': ''}
+        )
+        assert response.status_code == HTTPStatus.FOUND
+
+    benchmark(post)
@@ -0,0 +1,84 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+LIST_KEY = 'notes:list:{author_id}:{version}:{after}:{per_page}'
+VERSION_KEY = 'notes:list-version:{author_id}'
+STATS_KEY = 'notes:list-stats:{event}'
+
+
+def list_version(author_id):
+    """
+    Версия списка заметок автора.
+
+    Версия — отметка времени, а не счётчик: после вытеснения ключа из кэша
+    новая версия не совпадёт ни с одной из старых.
+    """
+    key = VERSION_KEY.format(author_id=author_id)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.set(key, version, None)
+    return version
+
+
+def invalidate_notes(author_id):
+    """
+    Сбрасывает все закэшированные списки автора.
+
+    Версия меняется сразу и ещё раз после коммита: список, собранный
+    между ними по старым данным, не останется с новой версией.
+    """
+    def bump():
+        cache.set(
+            VERSION_KEY.format(author_id=author_id), time.time_ns(), None
+        )
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def count(event):
+    key = STATS_KEY.format(event=event)
+    if not cache.add(key, 1, None):
+        cache.incr(key)
+
+
+def note_rows(queryset, after, per_page):
+    """
+    Строки (id, slug, title) заметок с id больше after.
+
+    Строк выбирается на одну больше per_page, чтобы знать, есть ли
+    следующая страница.
+    """
+    return list(
+        queryset.filter(pk__gt=after).values('id', 'slug', 'title')[
+            :per_page + 1
+        ]
+    )
+
+
+def cached_note_rows(author_id, queryset, after, per_page):
+    """Строки страницы списка заметок автора через кэш."""
+    key = LIST_KEY.format(
+        author_id=author_id, version=list_version(author_id),
+        after=after, per_page=per_page,
+    )
+    rows = cache.get(key)
+    if rows is None:
+        count('miss')
+        rows = note_rows(queryset, after, per_page)
+        cache.set(key, rows, settings.NOTES_LIST_CACHE_TIMEOUT)
+    else:
+        count('hit')
+    return rows
+
+
+def cache_stats():
+    """Счётчики попаданий и промахов кэша списков."""
+    return {
+        event: cache.get(STATS_KEY.format(event=event), 0)
+        for event in ('hit', 'miss')
+    }
@@ -0,0 +1,15 @@
+from django.core.checks import register
+
+from ya_common.caching import process_local_cache_errors
+
+
+@register()
+def shared_cache(app_configs, **kwargs):
+    """
+    Версии списков заметок хранятся в кэше и должны быть общими.
+
+    С кэшем в памяти процесса правка, сделанная одним воркером, не
+    сбрасывает список в другом, а notes_cache_stats видит только свои
+    нулевые счётчики.
+    """
+    return process_local_cache_errors('notes.E001')
@@ -1,9 +1,8 @@
-from pytils.translit import slugify
-
 from django import forms
 from django.core.exceptions import ValidationError
 
 from .models import Note
+from .slugs import allocate_slug
 
 
 WARNING = ' - такой slug уже существует, придумайте уникальное значение!'
@@ -17,14 +16,31 @@ class NoteForm(forms.ModelForm):
         fields = ('title', 'text', 'slug')
 
     def clean_slug(self):
-        """Обрабатывает случай, если slug не уникален."""
-        cleaned_data = super().clean()
-        slug = cleaned_data.get('slug')
+        """
+        Обрабатывает случай, если slug не уникален.
+
+        Пустой slug генерируется из заголовка со свободным суффиксом,
+        занятый slug, введённый вручную, остаётся ошибкой.
+        """
+        slug = self.cleaned_data.get('slug')
+        notes = Note.objects.exclude(id=self.instance.pk)
         if not slug:
-            title = cleaned_data.get('title')
-            slug = slugify(title)[:100]
-        if Note.objects.filter(
-                slug=slug
-        ).exclude(id=self.instance.pk).exists():
+            return allocate_slug(notes, self.cleaned_data.get('title', ''))
+        if notes.filter(slug=slug).exists():
             raise ValidationError(slug + WARNING)
         return slug
+
+    def validate_unique(self):
+        """
+        Уникальность slug проверена в clean_slug.
+
+        Повторная проверка ModelForm стоила бы ещё одного запроса и
+        всё равно не закрывает гонку: её ловит уникальный индекс при
+        сохранении, см. NoteFormMixin.
+        """
+        exclude = self._get_validation_exclusions()
+        exclude.add('slug')
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as error:
+            self._update_errors(error)
@@ -0,0 +1,53 @@
+"""
+Смесь запросов к YaNote для нагрузочного прогона load_test.py.
+
+Заметки для запросов берутся случайной выборкой, поэтому авторы с
+большим числом заметок попадают в нагрузку пропорционально чаще.
+"""
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from .models import Note
+
+SAMPLE_SIZE = 10_000
+
+
+def request_mix(rng):
+    """
+    Пары (вес, фабрика запроса) для URL из notes.urls.
+
+    Фабрика возвращает имя URL, путь и пользователя, от имени которого
+    идёт запрос (None — аноним).
+    """
+    notes = list(
+        Note.objects.order_by('?').values_list('author_id', 'slug')[
+            :SAMPLE_SIZE
+        ]
+    )
+    authors = get_user_model().objects.in_bulk(
+        {author_id for author_id, _ in notes}
+    )
+
+    def page(name):
+        def build():
+            author_id, _ = rng.choice(notes)
+            return name, reverse(name), authors[author_id]
+        return build
+
+    def note_page(name):
+        def build():
+            author_id, slug = rng.choice(notes)
+            return name, reverse(name, args=(slug,)), authors[author_id]
+        return build
+
+    mix = [(10, lambda: ('notes:home', reverse('notes:home'), None))]
+    if notes:
+        mix += [
+            (30, page('notes:list')),
+            (15, page('notes:list-json')),
+            (5, page('notes:add')),
+            (25, note_page('notes:detail')),
+            (10, note_page('notes:edit')),
+            (5, page('notes:success')),
+        ]
+    return mix
@@ -0,0 +1,44 @@
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+
+from notes.models import Note
+from notes.transfer import (
+    FORMATS, Progress, RowWriter, export_notes, guess_format,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает заметки в JSON Lines или CSV, читая базу курсором, '
+        'чтобы память не росла с числом заметок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default='-', help='Файл или - для stdout.'
+        )
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--author', help='Только заметки этого автора.')
+
+    def handle(self, *args, **options):
+        path = options['output']
+        file_format = options['format'] or guess_format(path)
+        queryset = Note.objects.all()
+        if options['author']:
+            queryset = queryset.filter(author__username=options['author'])
+        progress = Progress(self.stderr.write, 'Выгружено заметок')
+        if path == '-':
+            target = nullcontext(self.stdout)
+        else:
+            target = open(path, 'w', encoding='utf-8', newline='')
+        with target as stream:
+            export_notes(
+                queryset, RowWriter(stream, file_format),
+                options['chunk_size'], progress,
+            )
+        self.stderr.write(self.style.SUCCESS(
+            f'Выгружено заметок: {progress.total}, '
+            f'{progress.rate:.0f} в секунду'
+        ))
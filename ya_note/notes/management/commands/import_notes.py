@@ -0,0 +1,46 @@
+import sys
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.transfer import (
+    FORMATS, Progress, guess_format, import_notes, read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает заметки из JSON Lines или CSV пачками через bulk_create. '
+        'Поля строки: title, text, slug, author (username).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл или - для stdin.')
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument(
+            '--author', help='Автор для строк без поля author.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or guess_format(path)
+        progress = Progress(self.stderr.write, 'Загружено заметок')
+        if path == '-':
+            source = nullcontext(sys.stdin)
+        else:
+            source = open(path, encoding='utf-8', newline='')
+        try:
+            with source as stream:
+                import_notes(
+                    read_rows(stream, file_format), options['chunk_size'],
+                    progress, options['author'],
+                )
+        except (ValueError, KeyError) as error:
+            raise CommandError(
+                f'Ошибка после {progress.total} заметок: {error}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено заметок: {progress.total}, '
+            f'{progress.rate:.0f} в секунду'
+        ))
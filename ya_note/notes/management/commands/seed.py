@@ -0,0 +1,33 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from notes.seeding import seed_notes
+from ya_common.seeding import PASSWORD, seed_users
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями и заметками. '
+        f'Пароль пользователей: {PASSWORD}.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--notes', type=int, default=100_000)
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+        users = seed_users(options['users'])
+        notes = seed_notes(
+            rng, users, options['notes'], options['chunk_size'],
+            self.stderr.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано пользователей: {len(users)}, заметок: {notes} за '
+            f'{time.perf_counter() - started:.1f} с'
+        ))
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from ya_common.fts import fts5_index
+
+
+class Migration(migrations.Migration):
+    """
+    Полнотекстовый индекс FTS5 по заметкам.
+
+    Колонка author_id тоже индексируется: поиск всегда идёт с условием на
+    автора, и FTS5 пересекает его с остальными словами прямо в индексе.
+    """
+
+    dependencies = [
+        ('notes', '0001_initial'),
+    ]
+
+    operations = [
+        fts5_index('notes_note', ('title', 'text'), ('author_id',)),
+    ]
@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.db import models
 
-from pytils.translit import slugify
+from .slugs import allocate_slug
 
 
 class Note(models.Model):
@@ -28,11 +28,18 @@ class Note(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        ordering = ('id',)
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
+            self.slug = allocate_slug(
+                type(self).objects.exclude(pk=self.pk), self.title
+            )
         super().save(*args, **kwargs)
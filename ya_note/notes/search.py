@@ -0,0 +1,30 @@
+from django.db.models.expressions import RawSQL
+
+from ya_common.search import prefix_terms
+
+# Виртуальная таблица FTS5 из миграции 0002_note_search_index.
+FTS_TABLE = 'notes_note_fts'
+
+
+def build_match(author_id, text):
+    """
+    Выражение MATCH по заметкам автора.
+
+    Слова ищутся по префиксу основы только в заголовке и тексте, условие
+    на автора входит в само выражение.
+    """
+    terms = prefix_terms(text)
+    if not terms:
+        return ''
+    return f'author_id : "{int(author_id)}" AND {{title text}} : ({terms})'
+
+
+def search_notes(queryset, author_id, text):
+    """Заметки автора из queryset, подходящие под строку поиска."""
+    match = build_match(author_id, text)
+    if not match:
+        return queryset.none()
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (match,),
+    ))
@@ -0,0 +1,25 @@
+"""
+Синтетические заметки для замеров на больших объёмах.
+
+Число заметок у пользователей распределено по закону Ципфа: у немногих
+авторов тысячи заметок, у большинства — единицы. Заметки сохраняются
+тем же путём, что и import_notes, со slug из pytils.
+"""
+from ya_common.seeding import lognormal, sentence, zipf_weights
+
+from .transfer import Progress, import_notes
+
+
+def note_rows(rng, users, count):
+    weights = zipf_weights(len(users))
+    for author in rng.choices(users, cum_weights=weights, k=count):
+        yield {
+            'title': sentence(rng, rng.randint(1, 6))[:100],
+            'text': sentence(rng, lognormal(rng, 60, 1, 1, 3000)),
+            'author': author.username,
+        }
+
+
+def seed_notes(rng, users, count, chunk_size, report):
+    progress = Progress(report, 'Заметок')
+    return import_notes(note_rows(rng, users, count), chunk_size, progress)
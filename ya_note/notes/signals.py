@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import invalidate_notes
+from .models import Note
+
+
+@receiver((post_save, post_delete), sender=Note)
+def invalidate_notes_list(sender, instance, **kwargs):
+    """Любое изменение заметки сбрасывает кэш списка её автора."""
+    invalidate_notes(instance.author_id)
@@ -0,0 +1,95 @@
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from pytils.translit import slugify
+
+# Под суффикс вида -123 оставляем место при обрезке длинных slug.
+MAX_SUFFIX_LENGTH = 8
+# Сколько диапазонов slug проверяется одним запросом: каждый — два
+# параметра, а их число в запросе SQLite ограничено.
+RANGES_PER_QUERY = 400
+
+
+def pick_free_slug(base, taken, max_length, number=2):
+    """
+    Первый свободный из base, base-2, base-3, ... без обращений к базе.
+
+    Возвращает slug и номер, с которого стоит продолжить поиск для той же
+    основы, чтобы повторы в пачке не перебирали суффиксы заново.
+    """
+    if base not in taken:
+        return base, number
+    while True:
+        suffix = f'-{number}'
+        candidate = base[:max_length - len(suffix)] + suffix
+        number += 1
+        if candidate not in taken:
+            return candidate, number
+
+
+def collision_ranges(base, max_length):
+    """
+    Диапазоны slug, с которыми может столкнуться base или base-N.
+
+    Если суффикс помещается без обрезки, это сама основа и диапазон
+    base-…, иначе все slug с началом, которое останется после обрезки.
+    """
+    if len(base) + MAX_SUFFIX_LENGTH <= max_length:
+        return ((base, base), (f'{base}-', f'{base}-\uffff'))
+    prefix = base[:max_length - MAX_SUFFIX_LENGTH]
+    return ((prefix, prefix + '\uffff'),)
+
+
+def taken_slugs(queryset, bases, max_length):
+    """
+    Занятые slug, которые могут столкнуться с любой из основ bases.
+
+    Диапазоны передаются списком VALUES и соединяются с таблицей: SQLite
+    проходит уникальный индекс по slug для каждого диапазона, а цепочка
+    из сотен OR не собирается ни в ORM, ни в планировщике.
+    """
+    ranges = sorted({
+        bounds for base in bases if base
+        for bounds in collision_ranges(base, max_length)
+    })
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    taken = set()
+    for start in range(0, len(ranges), RANGES_PER_QUERY):
+        batch = ranges[start:start + RANGES_PER_QUERY]
+        values = ', '.join(['(%s, %s)'] * len(batch))
+        taken.update(queryset.filter(slug__in=RawSQL(
+            f'SELECT note.slug FROM (VALUES {values}) AS bounds '
+            f'JOIN {table} AS note '
+            f'ON note.slug BETWEEN bounds.column1 AND bounds.column2',
+            [value for bounds in batch for value in bounds],
+        )).order_by().values_list('slug', flat=True))
+    return taken
+
+
+def allocate_slugs(queryset, bases):
+    """
+    Уникальные slug для пачки заметок по их основам.
+
+    Занятые варианты выбираются одним запросом на каждые
+    RANGES_PER_QUERY диапазонов, совпадения внутри пачки разводятся суффиксами
+    в памяти. Уникальный индекс в базе остаётся последней проверкой на
+    случай параллельной вставки.
+    """
+    max_length = queryset.model._meta.get_field('slug').max_length
+    bases = [base[:max_length] for base in bases]
+    taken = taken_slugs(queryset, bases, max_length)
+    numbers = {}
+    slugs = []
+    for base in bases:
+        slug = base
+        if base:
+            slug, numbers[base] = pick_free_slug(
+                base, taken, max_length, numbers.get(base, 2)
+            )
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def allocate_slug(queryset, title):
+    """Уникальный slug для заметки с заголовком title."""
+    return allocate_slugs(queryset, [slugify(title)])[0]
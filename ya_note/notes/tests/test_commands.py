@@ -0,0 +1,128 @@
+import json
+import random
+import tempfile
+from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from notes.load import request_mix
+from notes.models import Note
+from notes.slugs import allocate_slugs
+
+from .test_mixins import BaseTestData, NOTES_LIST_URL, login
+
+
+class TestNotesTransfer(BaseTestData):
+    """Тесты команд импорта и экспорта заметок."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def run_command(self, *args, **options):
+        stdout, stderr = StringIO(), StringIO()
+        call_command(*args, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def write_jsonl(self, rows):
+        path = self.directory / 'notes.jsonl'
+        path.write_text(
+            ''.join(json.dumps(row, ensure_ascii=False) + '\n'
+                    for row in rows),
+            encoding='utf-8',
+        )
+        return path
+
+    def test_export_import_round_trip(self):
+        """Выгрузка в CSV и загрузка обратно сохраняют все поля."""
+        path = self.directory / 'notes.csv'
+        self.run_command('export_notes', output=str(path))
+        Note.objects.all().delete()
+        self.run_command('import_notes', str(path))
+        self.assertEqual(
+            list(Note.objects.values('title', 'text', 'slug', 'author')),
+            [{'title': self.note.title, 'text': self.note.text,
+              'slug': self.note.slug, 'author': self.author.pk}],
+        )
+
+    def test_export_streams_jsonl(self):
+        """Экспорт в stdout — по строке JSON на заметку."""
+        output, progress = self.run_command('export_notes', chunk_size=1)
+        self.assertEqual(json.loads(output), {
+            'title': self.note.title, 'text': self.note.text,
+            'slug': self.note.slug, 'author': self.author.username,
+        })
+        self.assertIn('Выгружено заметок: 1', progress)
+
+    def test_import_dedupes_slugs_in_chunks(self):
+        """Совпадающие slug разводятся суффиксами внутри и между пачками."""
+        path = self.write_jsonl(
+            [{'title': 'Заголовок', 'text': 'Текст'}] * 5
+            + [{'title': 'Другой', 'text': 'Текст', 'slug': self.note.slug}]
+        )
+        output, progress = self.run_command(
+            'import_notes', str(path), chunk_size=2,
+            author=self.not_author.username,
+        )
+        self.assertIn('Загружено заметок: 6', output)
+        self.assertEqual(progress.count('Загружено заметок'), 3)
+        slugs = set(Note.objects.values_list('slug', flat=True))
+        self.assertEqual(slugs, {
+            self.note.slug, 'zagolovok', 'zagolovok-2', 'zagolovok-3',
+            'zagolovok-4', 'zagolovok-5', f'{self.note.slug}-2',
+        })
+
+    def test_import_invalidates_list_cache(self):
+        """После bulk_create автор видит новые заметки в списке."""
+        self.author_client.get(NOTES_LIST_URL)
+        self.run_command('import_notes', str(self.write_jsonl([
+            {'title': 'Импорт', 'text': 'Текст', 'author': 'Автор'}
+        ])))
+        titles = [
+            note['title'] for note in
+            self.author_client.get(NOTES_LIST_URL).context['notes']
+        ]
+        self.assertIn('Импорт', titles)
+
+    def test_import_unknown_author(self):
+        """Неизвестный автор останавливает загрузку с понятной ошибкой."""
+        path = self.write_jsonl([{'title': 'Т', 'text': 'Т', 'author': '?'}])
+        with self.assertRaisesMessage(CommandError, 'Нет пользователей: ?'):
+            self.run_command('import_notes', str(path))
+
+    def test_allocate_slugs_splits_prefix_queries(self):
+        """Основы проверяются пачками, чтобы не упереться в лимиты SQLite."""
+        with self.assertNumQueries(5):
+            slugs = allocate_slugs(
+                Note.objects.all(),
+                [f'slug-{index}' for index in range(1000)],
+            )
+        self.assertEqual(len(set(slugs)), 1000)
+
+
+class TestSeed(BaseTestData):
+    """Тесты генератора синтетических данных и смеси нагрузки."""
+
+    def test_seed_creates_notes_with_slugs(self):
+        """Заметки создаются с уникальными slug из кириллических заголовков."""
+        call_command('seed', users=3, notes=50, stdout=StringIO(),
+                     stderr=StringIO())
+        notes = Note.objects.exclude(pk=self.note.pk)
+        self.assertEqual(notes.count(), 50)
+        self.assertNotIn('', notes.values_list('slug', flat=True))
+
+    def test_request_mix_pages_respond(self):
+        """Каждый запрос из смеси нагрузки открывается без ошибок."""
+        rng = random.Random(0)
+        for _, build in request_mix(rng):
+            name, url, user = build()
+            client = self.client if user is None else login(
+                self.client_class(), user
+            )
+            with self.subTest(name=name):
+                self.assertEqual(client.get(url).status_code, HTTPStatus.OK)
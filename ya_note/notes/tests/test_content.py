@@ -1,9 +1,20 @@
+import tempfile
+from http import HTTPStatus
+
+from django.core.cache import caches
+from django.test import override_settings
+
+from notes.caching import cache_stats, list_version
+from notes.checks import shared_cache
 from notes.forms import NoteForm
+from notes.models import Note
 
 from .test_mixins import (
     BaseTestData,
     NOTE_ADD_URL,
+    NOTE_DELETE_URL,
     NOTE_EDIT_URL,
+    NOTES_LIST_JSON_URL,
     NOTES_LIST_URL,
 )
 
@@ -43,3 +54,182 @@ class TestPagesContainsForm(BaseTestData):
             with self.subTest(url=url):
                 response = self.author_client.get(url)
                 self.assertIsInstance(response.context.get('form'), NoteForm)
+
+
+class TestNotesListCache(BaseTestData):
+    """Тесты кэша списка заметок."""
+
+    def titles(self, client):
+        return [
+            note['title']
+            for note in client.get(NOTES_LIST_URL).context['notes']
+        ]
+
+    def test_repeated_list_is_served_from_cache(self):
+        """Повторный запрос списка не обращается к таблице заметок."""
+        first = self.author_client.get(NOTES_LIST_URL)
+        second = self.author_client.get(NOTES_LIST_URL)
+        self.assertEqual(first.context['notes'], second.context['notes'])
+        self.assertLess(
+            len(second.captured_queries), len(first.captured_queries)
+        )
+        self.assertEqual(cache_stats(), {'hit': 1, 'miss': 1})
+
+    def test_list_is_invalidated_by_changes(self):
+        """Создание, правка и удаление заметки сбрасывают кэш автора."""
+        self.titles(self.author_client)
+        self.author_client.post(NOTE_ADD_URL, data={
+            'title': 'Свежая', 'text': 'Текст', 'slug': 'fresh'
+        })
+        self.assertIn('Свежая', self.titles(self.author_client))
+        self.author_client.post(NOTE_EDIT_URL, data=self.form_data)
+        self.assertIn(
+            self.form_data['title'], self.titles(self.author_client)
+        )
+        Note.objects.filter(slug='fresh').delete()
+        self.assertNotIn('Свежая', self.titles(self.author_client))
+
+    def test_list_is_invalidated_after_commit(self):
+        """Список, собранный до коммита изменения, после него устаревает."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(
+                title='Свежая', text='Текст', slug='fresh', author=self.author
+            )
+            version = list_version(self.author.pk)
+        self.assertNotEqual(list_version(self.author.pk), version)
+
+    def test_cache_is_per_author(self):
+        """Другой автор не получает чужой закэшированный список."""
+        self.titles(self.author_client)
+        self.assertEqual(self.titles(self.not_author_client), [])
+
+    def test_file_based_cache(self):
+        """С файловым кэшем список так же кэшируется и сбрасывается."""
+        with tempfile.TemporaryDirectory() as location, override_settings(
+            CACHES={'default': {
+                'BACKEND': 'ya_common.caching.FileBasedCache',
+                'LOCATION': location,
+            }}
+        ):
+            self.titles(self.author_client)
+            self.titles(self.author_client)
+            # Экземпляр кэша другого процесса видит те же счётчики.
+            del caches['default']
+            self.assertEqual(cache_stats(), {'hit': 1, 'miss': 1})
+            self.author_client.delete(NOTE_DELETE_URL)
+            self.assertEqual(self.titles(self.author_client), [])
+
+    def test_shared_cache_check(self):
+        """Проверка проекта не пропускает кэш в памяти процесса."""
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'ya_common.caching.FileBasedCache',
+            'LOCATION': '/tmp/yanote-cache',
+        }}):
+            self.assertEqual(shared_cache(None), [])
+        self.assertEqual(
+            [error.id for error in shared_cache(None)], ['notes.E001']
+        )
+
+
+class TestNotesSearch(BaseTestData):
+    """Тесты поиска по своим заметкам."""
+
+    def found(self, client, query):
+        return [
+            note['title'] for note in client.get(
+                NOTES_LIST_URL, {'q': query}
+            ).context['notes']
+        ]
+
+    def test_search_word_forms(self):
+        """Находятся разные формы слова в заголовке и тексте."""
+        Note.objects.create(
+            title='Покупки', text='Зелёные яблоки', author=self.author
+        )
+        for query in ('покупкам', 'зеленое яблоко', 'ЯБЛОК'):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.found(self.author_client, query), ['Покупки']
+                )
+
+    def test_search_is_author_scoped(self):
+        """Чужие заметки в поиск не попадают."""
+        Note.objects.create(
+            title='Заголовок', text='Текст', author=self.not_author
+        )
+        self.assertEqual(self.found(self.author_client, 'заголовок'), [
+            self.note.title
+        ])
+        self.assertEqual(
+            self.found(self.not_author_client, str(self.author.pk)), []
+        )
+
+    def test_search_follows_changes(self):
+        """Индекс обновляется при правке и удалении заметки."""
+        self.author_client.post(NOTE_EDIT_URL, data=self.form_data)
+        self.assertEqual(self.found(self.author_client, 'заголовок'), [
+            self.form_data['title']
+        ])
+        self.assertEqual(self.found(self.author_client, 'новый текст'), [
+            self.form_data['title']
+        ])
+        Note.objects.filter(pk=self.note.pk).delete()
+        self.assertEqual(self.found(self.author_client, 'заголовок'), [])
+
+    def test_search_does_not_touch_list_cache(self):
+        """Результаты поиска не подменяют закэшированный список."""
+        self.found(self.author_client, 'нет такого')
+        self.assertEqual(cache_stats(), {'hit': 0, 'miss': 0})
+
+
+@override_settings(NOTES_COUNT_ON_PAGE=2)
+class TestNotesListPaging(BaseTestData):
+    """Тесты постраничного списка заметок."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Note.objects.bulk_create(
+            Note(title=f'Заметка {index}', text='Текст', slug=f'n-{index}',
+                 author=cls.author)
+            for index in range(4)
+        )
+
+    def test_pages_cover_list_in_id_order(self):
+        """Страницы проходят все заметки автора по порядку id."""
+        ids, url = [], NOTES_LIST_URL
+        while url:
+            response = self.author_client.get(url)
+            self.assertLessEqual(len(response.context['notes']), 2)
+            ids.extend(note['id'] for note in response.context['notes'])
+            url = response.context['next_page']
+        self.assertEqual(ids, list(
+            Note.objects.filter(author=self.author).values_list(
+                'id', flat=True
+            )
+        ))
+        self.assertEqual(ids, sorted(ids))
+
+    def test_first_page_is_limited_in_sql(self):
+        """Первая страница выбирается с LIMIT, а не целиком."""
+        response = self.author_client.get(NOTES_LIST_URL)
+        self.assertIn('LIMIT 3', response.captured_queries[-1]['sql'])
+
+    def test_json_variant(self):
+        """JSON-вариант отдаёт ту же страницу и ссылку на следующую."""
+        html = self.author_client.get(NOTES_LIST_URL).context
+        data = self.author_client.get(NOTES_LIST_JSON_URL).json()
+        self.assertEqual(data['notes'], html['notes'])
+        data = self.author_client.get(data['next']).json()
+        self.assertEqual(len(data['notes']), 2)
+
+    def test_broken_after(self):
+        """Некорректный параметр after даёт 400."""
+        for after in ('x', '-1', str(2 ** 63), '9' * 100):
+            with self.subTest(after=after):
+                response = self.author_client.get(
+                    NOTES_LIST_URL, {'after': after}
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST
+                )
@@ -1,12 +1,17 @@
 from http import HTTPStatus
+from unittest import mock
 
+from pytils.translit import slugify
 
+from notes.forms import NoteForm, WARNING
 from notes.models import Note
+from notes.slugs import allocate_slug
 from .test_mixins import (
     BaseTestData,
     NOTE_ADD_URL,
     NOTE_DELETE_URL,
     NOTE_EDIT_URL,
+    NOTE_SLUG,
     NOTE_SUCCESS_URL,
 )
 
@@ -94,3 +99,73 @@ class TestNoteOperations(BaseTestData):
         self.assertEqual(note_from_db.text, self.note.text)
         self.assertEqual(note_from_db.slug, self.note.slug)
         self.assertEqual(note_from_db.author, self.note.author)
+
+
+class TestSlugAllocation(BaseTestData):
+    """Тесты генерации slug при совпадениях."""
+
+    def test_empty_slug_gets_free_suffix(self):
+        """Пустой slug получает первый свободный суффикс."""
+        base = slugify(self.form_data['title'])
+        Note.objects.bulk_create(
+            Note(title='Занято', text='Текст', slug=slug, author=self.author)
+            for slug in (base, f'{base}-2', f'{base}-4')
+        )
+        self.form_data['slug'] = ''
+        response = self.author_client.post(NOTE_ADD_URL, data=self.form_data)
+        self.assertRedirects(response, NOTE_SUCCESS_URL)
+        self.assertTrue(Note.objects.filter(slug=f'{base}-3').exists())
+
+    def test_allocation_is_single_query(self):
+        """Подбор суффикса делает один запрос при любом числе совпадений."""
+        slugs = ['zagolovok'] + [f'zagolovok-{n}' for n in range(2, 50)]
+        Note.objects.bulk_create(
+            Note(title='Занято', text='Текст', slug=slug, author=self.author)
+            for slug in slugs
+        )
+        with self.assertNumQueries(1):
+            slug = allocate_slug(Note.objects.all(), 'Заголовок')
+        self.assertEqual(slug, 'zagolovok-50')
+
+    def test_long_title_suffix_fits_field(self):
+        """Суффикс не выводит slug за пределы длины поля."""
+        title = 'а' * 100
+        first = Note.objects.create(title=title, text='Текст',
+                                    author=self.author)
+        second = Note.objects.create(title=title, text='Текст',
+                                     author=self.author)
+        self.assertEqual(len(first.slug), 100)
+        self.assertEqual(second.slug, first.slug[:98] + '-2')
+
+    def test_form_checks_slug_once(self):
+        """Занятость slug форма проверяет одним запросом."""
+        with self.assertNumQueries(1):
+            self.assertTrue(NoteForm(data=self.form_data).is_valid())
+
+    @mock.patch.object(NoteForm, 'clean_slug', return_value=NOTE_SLUG)
+    def test_unique_index_is_final_check(self, clean_slug):
+        """Гонка за slug заканчивается ошибкой формы, а не 500."""
+        notes = set(Note.objects.values_list('id', flat=True))
+        response = self.author_client.post(NOTE_ADD_URL, data=self.form_data)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            response.context['form'].errors['slug'], [NOTE_SLUG + WARNING]
+        )
+        self.assertEqual(
+            notes, set(Note.objects.values_list('id', flat=True))
+        )
+
+    @mock.patch.object(NoteForm, 'clean_slug', return_value='other-note')
+    def test_unique_index_is_final_check_on_edit(self, clean_slug):
+        """Гонка за slug при редактировании тоже возвращает форму."""
+        Note.objects.create(
+            title='Другая', text='Текст', slug='other-note',
+            author=self.not_author,
+        )
+        response = self.author_client.post(NOTE_EDIT_URL, data=self.form_data)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            response.context['form'].errors['slug'], ['other-note' + WARNING]
+        )
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.slug, NOTE_SLUG)
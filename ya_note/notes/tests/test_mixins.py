@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from notes.models import Note
+from ya_common import testing
+from ya_common.testing import SESSION_ENGINE, login
 
 
 User = get_user_model()
@@ -12,6 +15,7 @@ NOTE_SLUG = 'test-note'
 
 # Константы для URL
 NOTES_LIST_URL = reverse('notes:list')
+NOTES_LIST_JSON_URL = reverse('notes:list-json')
 NOTE_ADD_URL = reverse('notes:add')
 NOTE_EDIT_URL = reverse('notes:edit', args=[NOTE_SLUG])
 NOTE_DETAIL_URL = reverse('notes:detail', args=[NOTE_SLUG])
@@ -29,20 +33,49 @@ NOTE_DELETE_URL = reverse('notes:delete', args=[NOTE_SLUG])
 NOTE_EDIT_REDIRECT_URL = f'{LOGIN_URL}?next={NOTE_EDIT_URL}'
 NOTE_DELETE_REDIRECT_URL = f'{LOGIN_URL}?next={NOTE_DELETE_URL}'
 
+# Сколько SQL-запросов может выполнить страница за один HTTP-запрос.
+# Считаются все запросы, включая чтение пользователя; сессии в тестах
+# хранятся в подписанной куке и запросов не дают.
+QUERY_BUDGETS = {
+    'notes:home': {'GET': 1},
+    'notes:add': {'GET': 1},
+    'notes:edit': {'GET': 2},
+    'notes:detail': {'GET': 2},
+    'notes:delete': {'GET': 2},
+    'notes:list': {'GET': 2},
+    'notes:list-json': {'GET': 2},
+    'notes:success': {'GET': 1},
+}
 
+
+# У каждого процесса тестов своя база, поэтому и кэш должен быть своим.
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+class QueryBudgetClient(testing.QueryBudgetClient):
+    """Тестовый клиент с бюджетами страниц YaNote."""
+
+    budgets = QUERY_BUDGETS
+
+
+@override_settings(SESSION_ENGINE=SESSION_ENGINE, CACHES=TEST_CACHES)
 class BaseTestData(TestCase):
     """Базовый класс для тестовых данных."""
 
+    client_class = QueryBudgetClient
+
     @classmethod
     def setUpTestData(cls):
         """Подготовка тестовых данных."""
         cls.author = User.objects.create(username='Автор')
-        cls.author_client = Client()
-        cls.author_client.force_login(cls.author)
+        cls.author_client = login(QueryBudgetClient(), cls.author)
 
         cls.not_author = User.objects.create(username='Не автор')
-        cls.not_author_client = Client()
-        cls.not_author_client.force_login(cls.not_author)
+        cls.not_author_client = login(QueryBudgetClient(), cls.not_author)
 
         cls.note = Note.objects.create(
             title='Заголовок',
@@ -55,3 +88,7 @@ class BaseTestData(TestCase):
             'text': 'Новый текст',
             'slug': 'new-note'
         }
+
+    def setUp(self):
+        """Кэш не откатывается вместе с базой, очищаем его сами."""
+        cache.clear()
@@ -0,0 +1,96 @@
+import tempfile
+from pathlib import Path
+
+from django.test import override_settings
+
+from notes.models import Note
+from ya_common import profiling
+from .test_mixins import (
+    BaseTestData,
+    HOME_URL,
+    NOTE_ADD_URL,
+    NOTE_DELETE_URL,
+    NOTE_DETAIL_URL,
+    NOTE_EDIT_URL,
+    NOTE_SUCCESS_URL,
+    NOTES_LIST_URL,
+    QUERY_BUDGETS,
+    QueryBudgetClient,
+    login,
+)
+
+
+class TestQueryBudgets(BaseTestData):
+    """Число SQL-запросов страниц не зависит от числа заметок."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Note.objects.bulk_create(
+            Note(title=f'Заметка {index}', text='Текст',
+                 slug=f'note-{index}', author=cls.author)
+            for index in range(10)
+        )
+
+    def test_pages_fit_query_budget(self):
+        """Страницы укладываются в бюджет запросов."""
+        urls = (
+            (HOME_URL, 'notes:home'),
+            (NOTE_ADD_URL, 'notes:add'),
+            (NOTE_EDIT_URL, 'notes:edit'),
+            (NOTE_DETAIL_URL, 'notes:detail'),
+            (NOTE_DELETE_URL, 'notes:delete'),
+            (NOTES_LIST_URL, 'notes:list'),
+            (NOTE_SUCCESS_URL, 'notes:success'),
+        )
+        for url, view_name in urls:
+            with self.subTest(url=url):
+                response = self.author_client.get(url)
+                self.assertEqual(response.resolver_match.view_name, view_name)
+                self.assertLessEqual(
+                    len(response.captured_queries),
+                    QUERY_BUDGETS[view_name]['GET']
+                )
+
+    def test_budget_failure_reports_queries(self):
+        """Превышение бюджета показывает выполненный SQL."""
+        self.author_client.budgets = {'notes:list': {'GET': 1}}
+        with self.assertRaisesMessage(AssertionError, 'при бюджете 1'):
+            self.author_client.get(NOTES_LIST_URL)
+
+
+class TestProfiling(BaseTestData):
+    """Замеры запросов по настройке PROFILING."""
+
+    def test_disabled_by_default(self):
+        """Без настройки заголовка Server-Timing нет."""
+        response = self.author_client.get(NOTES_LIST_URL)
+        self.assertNotIn('Server-Timing', response.headers)
+
+    def test_server_timing_and_histogram(self):
+        """Server-Timing, гистограмма по имени URL и дамп cProfile."""
+        profiling.reset()
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            PROFILING=True, PROFILING_SAMPLE_RATE=1, PROFILING_DIR=directory
+        ):
+            client = login(QueryBudgetClient(), self.author)
+            response = client.get(NOTES_LIST_URL)
+            dumps = list(Path(directory).glob('notes-list-*.prof'))
+        queries = len(response.captured_queries)
+        self.assertIn(
+            f'desc="{queries} queries"', response.headers['Server-Timing']
+        )
+        stats = profiling.snapshot()['notes:list']
+        self.assertEqual(stats['count'], 1)
+        self.assertGreater(stats['template']['p50'], 0)
+        self.assertEqual(len(dumps), 1)
+
+    def test_unresolved_paths_share_key(self):
+        """Запросы мимо маршрутов копятся под одним ключом, а не по путям."""
+        profiling.reset()
+        with override_settings(PROFILING=True):
+            for number in range(3):
+                self.client.get(f'/missing/{number}/')
+        stats = profiling.snapshot()
+        self.assertEqual(stats.keys(), {profiling.UNRESOLVED})
+        self.assertEqual(stats[profiling.UNRESOLVED]['count'], 3)
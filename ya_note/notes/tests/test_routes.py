@@ -1,5 +1,7 @@
 from http import HTTPStatus
 
+from django.contrib.sessions.models import Session
+
 from .test_mixins import (
     BaseTestData,
     HOME_URL,
@@ -79,3 +81,9 @@ class TestRoutes(BaseTestData):
                     self.client.get(url),
                     redirect_url
                 )
+
+    def test_login_without_session_rows(self):
+        """Клиент авторизован, но таблица сессий не тронута."""
+        response = self.author_client.get(NOTES_LIST_URL)
+        self.assertEqual(response.context['user'], self.author)
+        self.assertFalse(Session.objects.exists())
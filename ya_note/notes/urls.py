@@ -11,5 +11,6 @@ urlpatterns = [
     path('note/<slug:slug>/', views.NoteDetail.as_view(), name='detail'),
     path('delete/<slug:slug>/', views.NoteDelete.as_view(), name='delete'),
     path('notes/', views.NotesList.as_view(), name='list'),
+    path('notes/json/', views.NotesListJson.as_view(), name='list-json'),
     path('done/', views.NoteSuccess.as_view(), name='success'),
 ]
@@ -1,9 +1,18 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import BadRequest
+from django.db import IntegrityError, transaction
+from django.http import HttpResponseRedirect, JsonResponse
 from django.urls import reverse_lazy
 from django.views import generic
 
-from .forms import NoteForm
+from .caching import cached_note_rows, note_rows
+from .forms import NoteForm, WARNING
 from .models import Note
+from .search import search_notes
+
+# Наибольший id BigAutoField; число больше драйвер SQLite не передаст.
+MAX_ID = 2 ** 63 - 1
 
 
 class Home(generic.TemplateView):
@@ -26,22 +35,39 @@ class NoteBase(LoginRequiredMixin):
         return self.model.objects.filter(author=self.request.user)
 
 
-class NoteCreate(NoteBase, generic.CreateView):
-    """Добавление заметки."""
+class NoteFormMixin:
+    """Создание и редактирование заметки через NoteForm."""
     template_name = 'notes/form.html'
     form_class = NoteForm
 
     def form_valid(self, form):
-        new_note = form.save(commit=False)
-        new_note.author = self.request.user
-        new_note.save()
+        """
+        Сохраняем заметку одним запросом.
+
+        Если slug успели занять между проверкой формы и записью,
+        уникальный индекс отклонит её, и форма вернётся с ошибкой.
+        """
+        note = form.save(commit=False)
+        try:
+            with transaction.atomic():
+                note.save()
+        except IntegrityError:
+            form.add_error('slug', note.slug + WARNING)
+            return self.form_invalid(form)
+        self.object = note
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class NoteCreate(NoteBase, NoteFormMixin, generic.CreateView):
+    """Добавление заметки."""
+
+    def form_valid(self, form):
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class NoteUpdate(NoteBase, generic.UpdateView):
+class NoteUpdate(NoteBase, NoteFormMixin, generic.UpdateView):
     """Редактирование заметки."""
-    template_name = 'notes/form.html'
-    form_class = NoteForm
 
 
 class NoteDelete(NoteBase, generic.DeleteView):
@@ -50,9 +76,66 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """
+    Список заметок пользователя по страницам.
+
+    Страница — заметки с id больше after в порядке id: выборка идёт по
+    индексу (author, id), и время первой страницы не зависит от числа
+    заметок. Шаблон выводит строки из кэша автора, сам queryset остаётся
+    ленивым и в базу не ходит, пока кэш свежий. С параметром q список
+    сужается поиском по своим заметкам и в кэш не попадает.
+    """
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.GET.get('q'):
+            queryset = search_notes(
+                queryset, self.request.user.pk, self.request.GET['q']
+            )
+        return queryset
+
+    def get_after(self):
+        """id, после которого начинается страница; вне BigAutoField — 400."""
+        try:
+            after = int(self.request.GET.get('after', 0))
+        except ValueError:
+            raise BadRequest('Некорректный параметр after.')
+        if not 0 <= after <= MAX_ID:
+            raise BadRequest('Некорректный параметр after.')
+        return after
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        per_page = settings.NOTES_COUNT_ON_PAGE
+        after = self.get_after()
+        context['query'] = self.request.GET.get('q', '')
+        if context['query']:
+            rows = note_rows(self.object_list, after, per_page)
+        else:
+            rows = cached_note_rows(
+                self.request.user.pk, self.object_list, after, per_page
+            )
+        context['notes'] = rows[:per_page]
+        context['next_page'] = None
+        if len(rows) > per_page:
+            params = self.request.GET.copy()
+            params['after'] = rows[per_page - 1]['id']
+            context['next_page'] = (
+                f'{self.request.path}?{params.urlencode()}'
+            )
+        return context
+
+
+class NotesListJson(NotesList):
+    """Та же страница списка заметок в JSON."""
+
+    def render_to_response(self, context, **response_kwargs):
+        return JsonResponse(
+            {'notes': context['notes'], 'next': context['next_page']},
+            **response_kwargs,
+        )
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ya_common.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,6 +57,42 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами потока, прагмы не повторяются.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Запись берёт блокировку в начале транзакции: при DEFERRED
+            # повышение блокировки на конфликте сразу падает с
+            # "database is locked", не дожидаясь timeout.
+            'transaction_mode': 'IMMEDIATE',
+            # Сколько секунд ждать чужую блокировку вместо ошибки.
+            'timeout': 5,
+            # Прагмы нового соединения: в режиме WAL читатели не ждут
+            # писателя, а fsync при synchronous=NORMAL идёт на контрольной
+            # точке, а не на каждый коммит. cache_size < 0 — размер
+            # страничного кэша в КиБ.
+            'init_command': (
+                'PRAGMA journal_mode = WAL;'
+                'PRAGMA synchronous = NORMAL;'
+                'PRAGMA cache_size = -64000;'
+                'PRAGMA mmap_size = 268435456'
+            ),
+        },
+    }
+}
+
+# Версии списков заметок и счётчики попаданий общие для всех процессов
+# сервера и команды notes_cache_stats, см. notes/checks.py. На каждого
+# автора приходится ключ версии и по ключу на открытую страницу списка.
+CACHES = {
+    'default': {
+        'BACKEND': 'ya_common.caching.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 50_000,
+            'CULL_FREQUENCY': 4,
+            'CULL_INTERVAL': 60,
+        },
     }
 }
 
@@ -88,3 +125,17 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
 NOTE_COUNT_ON_HOME_PAGE = 10
+
+NOTES_COUNT_ON_PAGE = 50
+
+# Списки заметок сбрасываются при каждом изменении заметки автора,
+# таймаут лишь ограничивает жизнь забытых записей.
+NOTES_LIST_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Замеры запросов в Server-Timing и гистограммы по URL,
+# см. ya_common/profiling.py.
+PROFILING = False
+PROFILING_HISTOGRAM_SIZE = 1000
+# Доля запросов, которые снимаются cProfile в PROFILING_DIR.
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_DIR = None